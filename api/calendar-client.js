@@ -0,0 +1,187 @@
+import crypto from 'crypto';
+
+const DEFAULT_BASE_URL = 'https://www.googleapis.com';
+const BATCH_PATH = '/batch/calendar/v3';
+
+// Google caps a Calendar batch at 50 requests
+export const MAX_BATCH_SIZE = 50;
+
+export class SyncTokenExpiredError extends Error {
+    constructor() {
+        super('Calendar sync token expired; a full sync is required');
+        this.name = 'SyncTokenExpiredError';
+    }
+}
+
+function splitHead(raw) {
+    const match = /\r?\n\r?\n/.exec(raw);
+    if (!match) return [raw, ''];
+    return [raw.slice(0, match.index), raw.slice(match.index + match[0].length)];
+}
+
+function parseHeaders(lines) {
+    const headers = {};
+    for (const line of lines) {
+        const separator = line.indexOf(':');
+        if (separator === -1) continue;
+        headers[line.slice(0, separator).trim().toLowerCase()] = line.slice(separator + 1).trim();
+    }
+    return headers;
+}
+
+/**
+ * Parse a raw HTTP/1.1 message (request or response) as embedded in a
+ * multipart/mixed batch part.
+ */
+export function parseHttpMessage(raw) {
+    const [head, body] = splitHead(raw.replace(/^\s+/, ''));
+    const [startLine, ...headerLines] = head.split(/\r?\n/);
+    return { startLine: startLine.trim(), headers: parseHeaders(headerLines), body: body.trim() };
+}
+
+/**
+ * Split a multipart/mixed body into its parts. Each part carries its own
+ * MIME headers (Content-ID etc.) and an HTTP message as the body.
+ */
+export function parseMultipart(body, boundary) {
+    return body
+        .split(`--${boundary}`)
+        .slice(1)
+        .filter(part => !part.startsWith('--'))
+        .map(part => {
+            const [head, inner] = splitHead(part.replace(/^\r?\n/, ''));
+            return { headers: parseHeaders(head.split(/\r?\n/)), http: parseHttpMessage(inner) };
+        });
+}
+
+export function buildMultipart(parts, boundary) {
+    const chunks = parts.map(({ contentId, http }) => [
+        `--${boundary}`,
+        'Content-Type: application/http',
+        `Content-ID: <${contentId}>`,
+        '',
+        http,
+    ].join('\r\n'));
+    return `${chunks.join('\r\n')}\r\n--${boundary}--\r\n`;
+}
+
+export function boundaryFrom(contentType) {
+    const match = /boundary=("?)([^";]+)\1/i.exec(contentType || '');
+    return match ? match[2] : null;
+}
+
+function serializeRequest({ method, path, headers = {}, body }) {
+    const lines = [`${method} ${path} HTTP/1.1`];
+    const allHeaders = body === undefined ? headers : { 'Content-Type': 'application/json', ...headers };
+    for (const [name, value] of Object.entries(allHeaders)) {
+        lines.push(`${name}: ${value}`);
+    }
+    return `${lines.join('\r\n')}\r\n\r\n${body === undefined ? '' : JSON.stringify(body)}`;
+}
+
+/**
+ * Minimal Google Calendar v3 client covering what the booking sync needs:
+ * incremental events.list with sync tokens, and batched event writes.
+ * `baseUrl` can point at a local fake server for tests.
+ */
+export function createCalendarClient({ calendarId, getAccessToken, baseUrl = DEFAULT_BASE_URL, fetchImpl = fetch }) {
+    const eventsPath = `/calendar/v3/calendars/${encodeURIComponent(calendarId)}/events`;
+    let requestCount = 0;
+
+    async function request(path, options = {}) {
+        const token = await getAccessToken();
+        requestCount++;
+        return fetchImpl(`${baseUrl}${path}`, {
+            ...options,
+            headers: { Authorization: `Bearer ${token}`, ...options.headers },
+        });
+    }
+
+    /**
+     * Fetch every event changed since `syncToken` (or all events when it's
+     * null), following pagination. Deleted events come back with status
+     * 'cancelled'.
+     */
+    async function listChanges(syncToken) {
+        const events = [];
+        let pageToken = null;
+
+        for (;;) {
+            const params = new URLSearchParams({ showDeleted: 'true', maxResults: '2500' });
+            if (syncToken) params.set('syncToken', syncToken);
+            if (pageToken) params.set('pageToken', pageToken);
+
+            const response = await request(`${eventsPath}?${params}`);
+            if (response.status === 410) {
+                throw new SyncTokenExpiredError();
+            }
+            if (!response.ok) {
+                throw new Error(`Calendar events.list failed: ${response.status} ${await response.text()}`);
+            }
+
+            const page = await response.json();
+            events.push(...(page.items || []));
+            if (page.nextPageToken) {
+                pageToken = page.nextPageToken;
+                continue;
+            }
+            return { events, nextSyncToken: page.nextSyncToken };
+        }
+    }
+
+    /**
+     * Send up to MAX_BATCH_SIZE event operations in one HTTP request.
+     * Each op is { method, eventId?, headers?, body? }; results come
+     * back in the same order as { status, body }.
+     */
+    async function batch(ops) {
+        if (ops.length > MAX_BATCH_SIZE) {
+            throw new Error(`Calendar batch limited to ${MAX_BATCH_SIZE} requests, got ${ops.length}`);
+        }
+
+        const boundary = `batch_${crypto.randomBytes(12).toString('hex')}`;
+        const parts = ops.map((op, i) => ({
+            contentId: `item${i}`,
+            http: serializeRequest({
+                method: op.method,
+                path: op.eventId ? `${eventsPath}/${encodeURIComponent(op.eventId)}` : eventsPath,
+                headers: op.headers,
+                body: op.body,
+            }),
+        }));
+
+        const response = await request(BATCH_PATH, {
+            method: 'POST',
+            headers: { 'Content-Type': `multipart/mixed; boundary=${boundary}` },
+            body: buildMultipart(parts, boundary),
+        });
+        if (!response.ok) {
+            throw new Error(`Calendar batch failed: ${response.status} ${await response.text()}`);
+        }
+
+        const responseBoundary = boundaryFrom(response.headers.get('content-type'));
+        const results = new Array(ops.length).fill(null);
+        for (const part of parseMultipart(await response.text(), responseBoundary)) {
+            const index = Number(/item(\d+)/.exec(part.headers['content-id'] || '')?.[1]);
+            const status = Number(part.http.startLine.split(' ')[1]);
+            let body = null;
+            if (part.http.body) {
+                try {
+                    body = JSON.parse(part.http.body);
+                } catch {
+                    body = part.http.body;
+                }
+            }
+            results[index] = { status, body };
+        }
+        return results.map(result => result || { status: 500, body: 'Missing batch response part' });
+    }
+
+    return {
+        listChanges,
+        batch,
+        get requestCount() {
+            return requestCount;
+        },
+    };
+}
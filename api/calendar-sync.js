@@ -0,0 +1,482 @@
+import crypto from 'crypto';
+import { MAX_BATCH_SIZE, SyncTokenExpiredError } from './calendar-client.js';
+
+export const DEFAULT_TIME_ZONE = 'America/Los_Angeles';
+
+// Re-read bookings updated shortly before the last run's watermark so rows
+// committed late aren't missed; unchanged ones are skipped by hash.
+const WATERMARK_OVERLAP_MS = 60 * 1000;
+
+// How many times a write is re-planned (e.g. insert → patch on 409)
+const MAX_ROUNDS = 3;
+
+const CONFLICT_POLICIES = ['local', 'remote', 'newest'];
+
+/**
+ * Calendar event ids must be base32hex (a-v, 0-9). Deriving the id from the
+ * booking UUID makes inserts idempotent: a retried insert gets a 409 rather
+ * than creating a duplicate event.
+ */
+export function bookingEventId(bookingId) {
+    return `bk${bookingId.replace(/-/g, '').toLowerCase()}`;
+}
+
+function toDateTime(date, time) {
+    return `${date}T${time.length === 5 ? `${time}:00` : time}`;
+}
+
+/**
+ * The calendar event a booking should have. Only these fields are owned by
+ * the sync; anything else on the event (colour, attendees...) is left alone.
+ */
+export function bookingToEvent(booking, timeZone = DEFAULT_TIME_ZONE) {
+    const serviceName = booking.service_types?.name || 'Booking';
+    const details = [
+        `Customer: ${booking.customer_name}`,
+        `Email: ${booking.customer_email}`,
+        booking.customer_phone && `Phone: ${booking.customer_phone}`,
+        booking.participants > 1 && `Participants: ${booking.participants}`,
+        booking.notes && `Notes: ${booking.notes}`,
+    ].filter(Boolean);
+
+    return {
+        summary: `${serviceName}: ${booking.customer_name}`,
+        description: details.join('\n'),
+        start: { dateTime: toDateTime(booking.booking_date, booking.start_time), timeZone },
+        end: { dateTime: toDateTime(booking.booking_date, booking.end_time), timeZone },
+        status: booking.status === 'pending' ? 'tentative' : 'confirmed',
+        extendedProperties: { private: { bookingId: booking.id } },
+    };
+}
+
+export function hashEvent(event) {
+    const owned = [event.summary, event.description, event.start, event.end, event.status];
+    return crypto.createHash('sha1').update(JSON.stringify(owned)).digest('hex');
+}
+
+/**
+ * Convert a remote event's start/end back into booking columns in the
+ * booking time zone.
+ */
+export function eventToBookingFields(event, timeZone = DEFAULT_TIME_ZONE) {
+    if (event.status === 'cancelled') {
+        return { status: 'cancelled' };
+    }
+    if (!event.start?.dateTime || !event.end?.dateTime) {
+        return {};
+    }
+
+    const format = new Intl.DateTimeFormat('en-CA', {
+        timeZone,
+        year: 'numeric',
+        month: '2-digit',
+        day: '2-digit',
+        hour: '2-digit',
+        minute: '2-digit',
+        second: '2-digit',
+        hourCycle: 'h23',
+    });
+    const local = value => {
+        if (!/(?:Z|[+-]\d{2}:\d{2})$/.test(value)) {
+            // No offset: already wall-clock time in the event's time zone
+            const [date, time] = value.split('T');
+            return { date, time: time.length === 5 ? `${time}:00` : time };
+        }
+        const parts = Object.fromEntries(format.formatToParts(new Date(value)).map(p => [p.type, p.value]));
+        return { date: `${parts.year}-${parts.month}-${parts.day}`, time: `${parts.hour}:${parts.minute}:${parts.second}` };
+    };
+
+    const start = local(event.start.dateTime);
+    const end = local(event.end.dateTime);
+    return { booking_date: start.date, start_time: start.time, end_time: end.time };
+}
+
+/**
+ * Hash of the owned fields as they stand on a remote event, comparable with
+ * hashEvent(bookingToEvent(...)) whatever offset Google reports times in.
+ */
+function hashRemoteEvent(event, timeZone) {
+    const fields = eventToBookingFields(event, timeZone);
+    if (!fields.booking_date) return null;
+    return hashEvent({
+        ...event,
+        start: { dateTime: toDateTime(fields.booking_date, fields.start_time), timeZone },
+        end: { dateTime: toDateTime(fields.booking_date, fields.end_time), timeZone },
+    });
+}
+
+function chooseWinner(policy, booking, remoteEvent, localChanged) {
+    if (policy === 'remote') return 'remote';
+    if (policy === 'newest') {
+        if (!localChanged) return 'remote';
+        return Date.parse(remoteEvent.updated) > Date.parse(booking.updated_at) ? 'remote' : 'local';
+    }
+    return 'local';
+}
+
+/**
+ * Work out the calendar write (if any) that brings one booking's event in
+ * line with the booking row.
+ */
+function planWrite(booking, remoteEvent, remoteChanged, timeZone) {
+    if (booking.status === 'cancelled') {
+        if (!booking.google_event_id) return null;
+        if (remoteEvent?.status === 'cancelled') {
+            return { kind: 'cleared', booking };
+        }
+        return { kind: 'delete', booking, request: { method: 'DELETE', eventId: booking.google_event_id } };
+    }
+
+    const event = bookingToEvent(booking, timeZone);
+    const hash = hashEvent(event);
+    if (booking.google_event_id && !remoteChanged && booking.google_event_hash === hash) {
+        return null;
+    }
+
+    if (!booking.google_event_id) {
+        return {
+            kind: 'insert',
+            booking,
+            hash,
+            request: { method: 'POST', body: { id: bookingEventId(booking.id), ...event } },
+        };
+    }
+    if (remoteEvent?.status === 'cancelled') {
+        // Deleted in the calendar but still live here: bring the event back.
+        // PATCH keeps attendees, colour and reminders; the owned status un-cancels it
+        return { kind: 'restore', booking, hash, request: { method: 'PATCH', eventId: booking.google_event_id, body: event } };
+    }
+
+    // Guard against edits made after we pulled
+    const etag = remoteChanged ? remoteEvent.etag : booking.google_event_etag;
+    const headers = etag ? { 'If-Match': etag } : undefined;
+    return { kind: 'patch', booking, hash, request: { method: 'PATCH', eventId: booking.google_event_id, headers, body: event } };
+}
+
+/**
+ * What to do with a failed write: re-plan it as a different request, treat
+ * it as done, or report it.
+ */
+function recoverWrite(write, status) {
+    const { booking } = write;
+    if (write.kind === 'insert' && status === 409) {
+        const { id, ...body } = write.request.body;
+        if (write.recreate) {
+            // The booking's own id is taken (or tombstoned); settle for a server-assigned one
+            return { retry: { ...write, request: { method: 'POST', body } } };
+        }
+        // An earlier run created the event but never recorded it
+        return { retry: { ...write, kind: 'patch', request: { method: 'PATCH', eventId: id, body } } };
+    }
+    if (write.kind === 'delete' && (status === 404 || status === 410)) {
+        return { done: true };
+    }
+    if ((write.kind === 'patch' || write.kind === 'restore') && (status === 404 || status === 410)) {
+        // The event is gone for good; recreate it under the booking's id so a
+        // lost writeback can't produce a duplicate, unless that id is the one gone
+        const id = bookingEventId(booking.id);
+        const body = bookingToEvent(booking, write.timeZone);
+        return {
+            retry: write.request.eventId === id
+                ? { ...write, kind: 'insert', request: { method: 'POST', body } }
+                : { ...write, kind: 'insert', recreate: true, request: { method: 'POST', body: { id, ...body } } },
+        };
+    }
+    if (status === 412) {
+        return { conflict: true };
+    }
+    return { error: true };
+}
+
+/**
+ * Reconcile bookings with Google Calendar.
+ *
+ * Pulls calendar changes with the stored sync token, reads only bookings
+ * whose updated_at moved past the stored watermark, then pushes the
+ * difference in batches of up to MAX_BATCH_SIZE.
+ *
+ * Calendar edits that leave the owned fields (see bookingToEvent) as the
+ * booking would have them - colour, attendees, reminders - are accepted
+ * as-is. Any other calendar edit is settled by `conflictPolicy`, and is
+ * reported as a conflict when the booking changed too:
+ *   'local'  - the booking row is the source of truth; the event is
+ *              patched back, or restored if it was deleted (default)
+ *   'remote' - calendar edits (time changes, deletions) are copied back
+ *   'newest' - whichever side was updated most recently wins; a calendar
+ *              edit to an unchanged booking is copied back
+ *
+ * A write that fails is retried on the next run: the bookings watermark
+ * stays behind locally changed bookings, and the sync token is not
+ * advanced past a calendar change that couldn't be settled.
+ */
+export async function syncBookingsWithCalendar({
+    store,
+    client,
+    calendarId,
+    timeZone = DEFAULT_TIME_ZONE,
+    conflictPolicy = 'local',
+    now = new Date(),
+}) {
+    const summary = {
+        fullSync: false,
+        remoteChanges: 0,
+        bookingsChecked: 0,
+        inserted: 0,
+        patched: 0,
+        restored: 0,
+        deleted: 0,
+        pulled: 0,
+        unchanged: 0,
+        conflicts: [],
+        errors: [],
+        requests: 0,
+    };
+    if (!CONFLICT_POLICIES.includes(conflictPolicy)) {
+        throw new Error(`Unknown conflict policy "${conflictPolicy}" (expected ${CONFLICT_POLICIES.join(', ')})`);
+    }
+    const requestsBefore = client.requestCount;
+    const syncedAt = now.toISOString();
+
+    const state = await store.getState(calendarId);
+    let remote;
+    try {
+        remote = await client.listChanges(state?.sync_token || null);
+    } catch (error) {
+        if (!(error instanceof SyncTokenExpiredError)) throw error;
+        remote = await client.listChanges(null);
+        summary.fullSync = true;
+    }
+    if (!state?.sync_token) summary.fullSync = true;
+
+    const remoteByBooking = new Map();
+    for (const event of remote.events) {
+        const bookingId = event.extendedProperties?.private?.bookingId;
+        if (bookingId) remoteByBooking.set(bookingId, event);
+    }
+    summary.remoteChanges = remoteByBooking.size;
+
+    // A full sync re-checks every booking; otherwise only what moved
+    const since = summary.fullSync || !state?.bookings_synced_through
+        ? null
+        : new Date(Date.parse(state.bookings_synced_through) - WATERMARK_OVERLAP_MS).toISOString();
+    const bookings = new Map((await store.changedBookings(since)).map(booking => [booking.id, booking]));
+    const changedIds = new Set(bookings.keys());
+
+    const remoteOnly = [...remoteByBooking.keys()].filter(id => !bookings.has(id));
+    if (remoteOnly.length > 0) {
+        for (const booking of await store.bookingsByIds(remoteOnly)) {
+            bookings.set(booking.id, booking);
+        }
+    }
+    summary.bookingsChecked = bookings.size;
+
+    const updates = [];
+    let writes = [];
+
+    for (const booking of bookings.values()) {
+        const remoteEvent = remoteByBooking.get(booking.id);
+        // Our own writes come back through the feed with the etag we stored;
+        // a delete returns no etag, but the booking is already unlinked
+        const remoteChanged = !!remoteEvent &&
+            remoteEvent.etag !== booking.google_event_etag &&
+            !(remoteEvent.status === 'cancelled' && !booking.google_event_id);
+
+        if (remoteChanged && booking.google_event_id && booking.status !== 'cancelled' &&
+            remoteEvent.status !== 'cancelled') {
+            const hash = hashEvent(bookingToEvent(booking, timeZone));
+            if (hashRemoteEvent(remoteEvent, timeZone) === hash) {
+                // Only fields we don't own were edited (or both sides agree)
+                updates.push({
+                    id: booking.id,
+                    fields: { google_event_etag: remoteEvent.etag, google_event_hash: hash, google_synced_at: syncedAt },
+                });
+                summary.unchanged++;
+                continue;
+            }
+        }
+
+        const localChanged = changedIds.has(booking.id) && (
+            !booking.google_event_id ||
+            (booking.status === 'cancelled' && !!booking.google_event_id) ||
+            booking.google_event_hash !== hashEvent(bookingToEvent(booking, timeZone))
+        );
+
+        if (remoteChanged && localChanged) {
+            summary.conflicts.push({
+                bookingId: booking.id,
+                eventId: remoteEvent.id,
+                resolution: chooseWinner(conflictPolicy, booking, remoteEvent, true),
+            });
+        }
+
+        if (remoteChanged && chooseWinner(conflictPolicy, booking, remoteEvent, localChanged) === 'remote') {
+            const fields = eventToBookingFields(remoteEvent, timeZone);
+            updates.push({
+                id: booking.id,
+                fields: fields.status === 'cancelled'
+                    ? { ...fields, ...clearedFields(syncedAt) }
+                    : {
+                        ...fields,
+                        google_event_id: remoteEvent.id,
+                        google_event_etag: remoteEvent.etag,
+                        google_event_hash: hashEvent(bookingToEvent({ ...booking, ...fields }, timeZone)),
+                        google_synced_at: syncedAt,
+                    },
+            });
+            summary.pulled++;
+            continue;
+        }
+
+        const write = planWrite(booking, remoteEvent, remoteChanged, timeZone);
+        if (!write) {
+            summary.unchanged++;
+        } else if (write.kind === 'cleared') {
+            updates.push({ id: booking.id, fields: clearedFields(syncedAt) });
+            summary.deleted++;
+        } else {
+            writes.push({ ...write, timeZone, remoteChanged });
+        }
+    }
+
+    // Writes that didn't land; the next run picks them up again
+    const heldBack = [];
+    for (let round = 0; round < MAX_ROUNDS && writes.length > 0; round++) {
+        const retries = [];
+        for (let i = 0; i < writes.length; i += MAX_BATCH_SIZE) {
+            const chunk = writes.slice(i, i + MAX_BATCH_SIZE);
+            const results = await client.batch(chunk.map(write => write.request));
+
+            chunk.forEach((write, j) => {
+                const { status, body } = results[j];
+                const { booking } = write;
+
+                if (status >= 200 && status < 300) {
+                    updates.push({
+                        id: booking.id,
+                        fields: write.kind === 'delete'
+                            ? clearedFields(syncedAt)
+                            : {
+                                google_event_id: body.id,
+                                google_event_etag: body.etag,
+                                google_event_hash: write.hash,
+                                google_synced_at: syncedAt,
+                            },
+                    });
+                    summary[{ insert: 'inserted', patch: 'patched', restore: 'restored', delete: 'deleted' }[write.kind]]++;
+                    return;
+                }
+
+                const recovery = recoverWrite(write, status);
+                if (recovery.retry) {
+                    retries.push(recovery.retry);
+                } else if (recovery.done) {
+                    updates.push({ id: booking.id, fields: clearedFields(syncedAt) });
+                    summary.deleted++;
+                } else if (recovery.conflict) {
+                    // Edited in the calendar after we pulled; next run sees both sides
+                    summary.conflicts.push({ bookingId: booking.id, eventId: booking.google_event_id, resolution: 'deferred' });
+                    heldBack.push(write);
+                } else {
+                    summary.errors.push({ bookingId: booking.id, status, message: body?.error?.message || body });
+                    heldBack.push(write);
+                }
+            });
+        }
+        writes = retries;
+    }
+    for (const write of writes) {
+        summary.errors.push({ bookingId: write.booking.id, status: null, message: 'Gave up after retries' });
+        heldBack.push(write);
+    }
+
+    await store.updateBookings(updates);
+
+    // Bookings that only came in through the calendar feed are replayed by
+    // the sync token, not the watermark
+    const watermarks = [
+        now.getTime(),
+        ...heldBack.filter(write => changedIds.has(write.booking.id)).map(write => Date.parse(write.booking.updated_at) - 1),
+    ];
+    // Re-read the same calendar changes next run rather than lose one.
+    // After a full sync there is no usable older token
+    const replayRemote = heldBack.some(write => write.remoteChanged);
+    await store.saveState(calendarId, {
+        sync_token: replayRemote ? (summary.fullSync ? null : state.sync_token) : remote.nextSyncToken,
+        bookings_synced_through: new Date(Math.min(...watermarks)).toISOString(),
+        last_run_at: syncedAt,
+        last_run_summary: { ...summary, requests: client.requestCount - requestsBefore },
+    });
+
+    summary.requests = client.requestCount - requestsBefore;
+    return summary;
+}
+
+function clearedFields(syncedAt) {
+    return { google_event_id: null, google_event_etag: null, google_event_hash: null, google_synced_at: syncedAt };
+}
+
+/**
+ * Booking/state persistence backed by Supabase (see migration 015).
+ */
+export function createSupabaseStore(supabase) {
+    const PAGE_SIZE = 1000;
+
+    return {
+        async getState(calendarId) {
+            const { data, error } = await supabase
+                .from('calendar_sync_state')
+                .select('*')
+                .eq('calendar_id', calendarId)
+                .maybeSingle();
+            if (error) throw error;
+            return data;
+        },
+
+        async saveState(calendarId, state) {
+            const { error } = await supabase
+                .from('calendar_sync_state')
+                .upsert({ calendar_id: calendarId, ...state, updated_at: new Date().toISOString() });
+            if (error) throw error;
+        },
+
+        async changedBookings(since) {
+            const rows = [];
+            for (let from = 0; ; from += PAGE_SIZE) {
+                let query = supabase
+                    .from('bookings')
+                    .select('*, service_types(name)')
+                    .order('updated_at', { ascending: true })
+                    .range(from, from + PAGE_SIZE - 1);
+                if (since) query = query.gt('updated_at', since);
+
+                const { data, error } = await query;
+                if (error) throw error;
+                rows.push(...data);
+                if (data.length < PAGE_SIZE) return rows;
+            }
+        },
+
+        async bookingsByIds(ids) {
+            const rows = [];
+            for (let i = 0; i < ids.length; i += 100) {
+                const { data, error } = await supabase
+                    .from('bookings')
+                    .select('*, service_types(name)')
+                    .in('id', ids.slice(i, i + 100));
+                if (error) throw error;
+                rows.push(...data);
+            }
+            return rows;
+        },
+
+        async updateBookings(updates) {
+            for (let i = 0; i < updates.length; i += 20) {
+                const results = await Promise.all(updates.slice(i, i + 20).map(({ id, fields }) =>
+                    supabase.from('bookings').update(fields).eq('id', id)
+                ));
+                const failed = results.find(result => result.error);
+                if (failed) throw failed.error;
+            }
+        },
+    };
+}
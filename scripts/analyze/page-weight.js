@@ -0,0 +1,347 @@
+import fs from 'fs';
+import { chromium } from 'playwright';
+import { fileURLToPath } from 'url';
+
+// Every HTML route served by server.js
+export const ROUTES = [
+    '/',
+    '/training',
+    '/diving',
+    '/detailing',
+    '/deliveries',
+    '/schedule',
+    '/admin',
+    '/inventory',
+    '/booking',
+];
+
+// Transfer budget per page in bytes; routes not listed use the default
+export const BUDGETS = {
+    default: 1024 * 1024,
+    '/admin': 2 * 1024 * 1024,
+    '/inventory': 2 * 1024 * 1024,
+};
+
+const VIEWPORT = { width: 1440, height: 900 };
+
+export function formatBytes(bytes) {
+    if (bytes >= 1024 * 1024) return `${(bytes / (1024 * 1024)).toFixed(2)} MB`;
+    if (bytes >= 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+    return `${bytes} B`;
+}
+
+export function budgetFor(route, budgets = BUDGETS) {
+    return budgets[route] ?? budgets.default;
+}
+
+/**
+ * Collects what the browser sees while it renders the page: paint timings,
+ * render-blocking resources and every image with its natural vs displayed size.
+ * Runs inside the page.
+ */
+async function inspectPage() {
+    const paints = Object.fromEntries(
+        performance.getEntriesByType('paint').map(entry => [entry.name, entry.startTime])
+    );
+
+    const resourceEntries = performance.getEntriesByType('resource');
+    let renderBlocking;
+    if (resourceEntries.some(entry => 'renderBlockingStatus' in entry)) {
+        renderBlocking = resourceEntries
+            .filter(entry => entry.renderBlockingStatus === 'blocking')
+            .map(entry => entry.name);
+    } else {
+        // No renderBlockingStatus outside Chromium; fall back to what's in <head>
+        renderBlocking = [
+            ...[...document.querySelectorAll('head link[rel="stylesheet"]')]
+                .filter(link => !link.media || matchMedia(link.media).matches)
+                .map(link => link.href),
+            ...[...document.querySelectorAll('head script[src]')]
+                .filter(script => !script.async && !script.defer && script.type !== 'module')
+                .map(script => script.src),
+        ];
+    }
+
+    const dpr = window.devicePixelRatio || 1;
+    const images = [];
+
+    for (const img of document.querySelectorAll('img')) {
+        if (!img.currentSrc || !img.naturalWidth) continue;
+        const rect = img.getBoundingClientRect();
+        images.push({
+            url: img.currentSrc,
+            kind: 'img',
+            naturalWidth: img.naturalWidth,
+            naturalHeight: img.naturalHeight,
+            displayWidth: Math.round(rect.width * dpr),
+            displayHeight: Math.round(rect.height * dpr),
+        });
+    }
+
+    const backgrounds = new Set();
+    for (const el of document.querySelectorAll('*')) {
+        const match = getComputedStyle(el).backgroundImage.match(/url\(["']?([^"')]+)["']?\)/);
+        if (!match || backgrounds.has(match[1])) continue;
+        backgrounds.add(match[1]);
+
+        const probe = new Image();
+        probe.src = match[1];
+        try {
+            await probe.decode();
+        } catch {
+            continue;
+        }
+        const rect = el.getBoundingClientRect();
+        images.push({
+            url: probe.src,
+            kind: 'background',
+            naturalWidth: probe.naturalWidth,
+            naturalHeight: probe.naturalHeight,
+            displayWidth: Math.round(rect.width * dpr),
+            displayHeight: Math.round(rect.height * dpr),
+        });
+    }
+
+    return {
+        firstPaint: paints['first-paint'] ?? null,
+        firstContentfulPaint: paints['first-contentful-paint'] ?? null,
+        renderBlocking,
+        images,
+    };
+}
+
+async function crawlRoute(browser, baseUrl, route) {
+    const context = await browser.newContext({ viewport: VIEWPORT });
+    const page = await context.newPage();
+    const pending = [];
+
+    page.on('requestfinished', request => {
+        pending.push((async () => {
+            const response = await request.response();
+            const sizes = await request.sizes().catch(() => null);
+            return {
+                url: request.url(),
+                type: request.resourceType(),
+                status: response ? response.status() : 0,
+                transferBytes: sizes ? sizes.responseHeadersSize + sizes.responseBodySize : 0,
+            };
+        })());
+    });
+
+    const url = new URL(route, baseUrl).href;
+    try {
+        const response = await page.goto(url, { waitUntil: 'load', timeout: 30000 });
+        const status = response ? response.status() : 0;
+        await page.waitForLoadState('networkidle', { timeout: 10000 }).catch(() => {});
+
+        const inspected = await page.evaluate(inspectPage);
+        const resources = await Promise.all(pending);
+        return summarizePage(route, status, resources, inspected);
+    } catch (error) {
+        return { route, status: 0, error: error.message.split('\n')[0] };
+    } finally {
+        await context.close();
+    }
+}
+
+/**
+ * Fold raw resource and image data into the per-page figures the report uses.
+ */
+export function summarizePage(route, status, resources, inspected) {
+    const byType = {};
+    let totalBytes = 0;
+    for (const resource of resources) {
+        byType[resource.type] = (byType[resource.type] || 0) + resource.transferBytes;
+        totalBytes += resource.transferBytes;
+    }
+
+    const transferByUrl = new Map(resources.map(resource => [resource.url, resource.transferBytes]));
+    const seen = new Set();
+    const images = [];
+    for (const image of inspected.images) {
+        if (seen.has(image.url)) continue;
+        seen.add(image.url);
+
+        // Decoded RGBA bitmap vs what the layout actually needs
+        const decodedBytes = image.naturalWidth * image.naturalHeight * 4;
+        const displayedBytes = image.displayWidth * image.displayHeight * 4;
+        images.push({
+            ...image,
+            transferBytes: transferByUrl.get(image.url) ?? 0,
+            decodedBytes,
+            displayedBytes,
+            oversizeRatio: displayedBytes > 0 ? decodedBytes / displayedBytes : null,
+        });
+    }
+
+    return {
+        route,
+        status,
+        totalBytes,
+        byType,
+        requests: resources.length,
+        firstPaint: inspected.firstPaint,
+        firstContentfulPaint: inspected.firstContentfulPaint,
+        renderBlocking: inspected.renderBlocking,
+        images,
+        resources,
+    };
+}
+
+/**
+ * Rank unique assets across all pages by transfer size, heaviest first.
+ */
+export function rankAssets(pages, limit = 15) {
+    const assets = new Map();
+    for (const page of pages) {
+        for (const resource of page.resources || []) {
+            const asset = assets.get(resource.url) || {
+                url: resource.url,
+                type: resource.type,
+                transferBytes: 0,
+                routes: [],
+            };
+            asset.transferBytes = Math.max(asset.transferBytes, resource.transferBytes);
+            if (!asset.routes.includes(page.route)) asset.routes.push(page.route);
+            assets.set(resource.url, asset);
+        }
+    }
+    return [...assets.values()]
+        .sort((a, b) => b.transferBytes - a.transferBytes)
+        .slice(0, limit);
+}
+
+export function checkBudgets(pages, budgets = BUDGETS) {
+    return pages
+        .filter(page => !page.error)
+        .map(page => ({ route: page.route, totalBytes: page.totalBytes, budget: budgetFor(page.route, budgets) }))
+        .filter(({ totalBytes, budget }) => totalBytes > budget);
+}
+
+export async function crawl({ baseUrl, routes = ROUTES, concurrency = 4 }) {
+    const browser = await chromium.launch();
+    const queue = [...routes];
+    const pages = [];
+
+    const worker = async () => {
+        while (queue.length > 0) {
+            const route = queue.shift();
+            const result = await crawlRoute(browser, baseUrl, route);
+            pages.push(result);
+            const mark = result.error || result.status >= 400 ? '✗' : '✓';
+            console.log(`${mark} ${route} ${result.error || formatBytes(result.totalBytes)}`);
+        }
+    };
+
+    try {
+        await Promise.all(Array.from({ length: Math.min(concurrency, routes.length) }, worker));
+    } finally {
+        await browser.close();
+    }
+
+    return routes.map(route => pages.find(page => page.route === route));
+}
+
+function printReport(pages, budgets) {
+    console.log('\n=== Page Weight ===');
+    for (const page of pages) {
+        if (page.error) {
+            console.log(`\n${page.route}: ${page.error}`);
+            continue;
+        }
+
+        const budget = budgetFor(page.route, budgets);
+        const fcp = page.firstContentfulPaint ?? page.firstPaint;
+        console.log(`\n${page.route} (HTTP ${page.status})`);
+        console.log(`  Total: ${formatBytes(page.totalBytes)} / budget ${formatBytes(budget)} in ${page.requests} requests`);
+        console.log(`  First render: ${fcp === null ? 'n/a' : `${Math.round(fcp)} ms`}`);
+
+        const types = Object.entries(page.byType).sort((a, b) => b[1] - a[1]);
+        for (const [type, bytes] of types) {
+            console.log(`    ${type.padEnd(12)} ${formatBytes(bytes)}`);
+        }
+
+        if (page.renderBlocking.length > 0) {
+            console.log('  Render-blocking:');
+            page.renderBlocking.forEach(url => console.log(`    ${url}`));
+        }
+
+        const oversized = page.images.filter(image => image.oversizeRatio && image.oversizeRatio > 2);
+        if (oversized.length > 0) {
+            console.log('  Oversized images (decoded vs displayed):');
+            for (const image of oversized) {
+                console.log(`    ${image.url} ${image.naturalWidth}x${image.naturalHeight} shown at ` +
+                    `${image.displayWidth}x${image.displayHeight}, ${formatBytes(image.decodedBytes)} decoded ` +
+                    `(${image.oversizeRatio.toFixed(1)}x)`);
+            }
+        }
+    }
+
+    console.log('\n=== Heaviest Assets ===');
+    rankAssets(pages).forEach((asset, i) => {
+        console.log(`${String(i + 1).padStart(2)}. ${formatBytes(asset.transferBytes).padStart(10)}  ` +
+            `${asset.type.padEnd(10)} ${asset.url}  [${asset.routes.join(', ')}]`);
+    });
+}
+
+function positiveNumber(flag, value, { integer = false } = {}) {
+    const number = Number(value);
+    if (!(number > 0) || (integer && !Number.isInteger(number))) {
+        throw new Error(`${flag} must be a positive ${integer ? 'integer' : 'number'}, got "${value}"`);
+    }
+    return number;
+}
+
+export function parseArgs(argv) {
+    const options = { baseUrl: 'http://localhost:3000', concurrency: 4, json: null, budget: null, routes: ROUTES };
+    for (let i = 0; i < argv.length; i++) {
+        const arg = argv[i];
+        if (arg === '--base-url') options.baseUrl = argv[++i];
+        else if (arg === '--concurrency') options.concurrency = positiveNumber(arg, argv[++i], { integer: true });
+        else if (arg === '--json') options.json = argv[++i];
+        else if (arg === '--budget-kb') options.budget = positiveNumber(arg, argv[++i]) * 1024;
+        else if (arg === '--route') options.routes = [...(options.routes === ROUTES ? [] : options.routes), argv[++i]];
+    }
+    return options;
+}
+
+async function main() {
+    const options = parseArgs(process.argv.slice(2));
+    const budgets = options.budget ? { default: options.budget } : BUDGETS;
+
+    console.log(`Crawling ${options.routes.length} routes on ${options.baseUrl} (${options.concurrency} at a time)`);
+    const pages = await crawl(options);
+    printReport(pages, budgets);
+
+    if (options.json) {
+        fs.writeFileSync(options.json, JSON.stringify({ pages, heaviest: rankAssets(pages) }, null, 2));
+        console.log(`\nReport written to ${options.json}`);
+    }
+
+    const overBudget = checkBudgets(pages, budgets);
+    const failed = pages.filter(page => page.error);
+    const missing = pages.filter(page => !page.error && page.status >= 400);
+    if (missing.length > 0) {
+        console.log(`\n⚠️  Not served here: ${missing.map(page => `${page.route} (HTTP ${page.status})`).join(', ')}`);
+    }
+    if (overBudget.length > 0) {
+        console.log('\n❌ Over budget:');
+        overBudget.forEach(({ route, totalBytes, budget }) => {
+            console.log(`  ${route}: ${formatBytes(totalBytes)} > ${formatBytes(budget)}`);
+        });
+    }
+    if (failed.length > 0) {
+        console.log(`\n❌ ${failed.length} route(s) failed to load: ${failed.map(page => page.route).join(', ')}`);
+    }
+    if (overBudget.length > 0 || failed.length > 0) {
+        process.exit(1);
+    }
+    console.log('\n✅ All pages within budget');
+}
+
+if (process.argv[1] === fileURLToPath(import.meta.url)) {
+    main().catch(error => {
+        console.error(error);
+        process.exit(1);
+    });
+}
@@ -0,0 +1,67 @@
+import { createClient } from '@supabase/supabase-js';
+import { OAuth2Client } from 'google-auth-library';
+import dotenv from 'dotenv';
+import { fileURLToPath } from 'url';
+import { dirname, join } from 'path';
+import { createCalendarClient } from '../api/calendar-client.js';
+import { syncBookingsWithCalendar, createSupabaseStore, DEFAULT_TIME_ZONE } from '../api/calendar-sync.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+// Load environment variables
+dotenv.config({ path: join(__dirname, '..', '.env') });
+
+const supabase = createClient(process.env.VITE_SUPABASE_URL, process.env.SUPABASE_SERVICE_KEY);
+
+const oauth2 = new OAuth2Client(
+    process.env.GOOGLE_CLIENT_ID,
+    process.env.GOOGLE_CLIENT_SECRET,
+    process.env.GOOGLE_REDIRECT_URI
+);
+oauth2.setCredentials({ refresh_token: process.env.GOOGLE_REFRESH_TOKEN });
+
+async function syncCalendar() {
+    const args = process.argv.slice(2);
+    const policyIndex = args.indexOf('--conflict-policy');
+    const conflictPolicy = policyIndex !== -1 ? args[policyIndex + 1] : 'local';
+    const calendarId = process.env.GOOGLE_CALENDAR_ID || 'primary';
+
+    const client = createCalendarClient({
+        calendarId,
+        baseUrl: process.env.GOOGLE_CALENDAR_API_URL,
+        getAccessToken: async () => (await oauth2.getAccessToken()).token,
+    });
+
+    console.log(`Syncing bookings with calendar ${calendarId} (conflict policy: ${conflictPolicy})...\n`);
+    const summary = await syncBookingsWithCalendar({
+        store: createSupabaseStore(supabase),
+        client,
+        calendarId,
+        timeZone: process.env.BOOKING_TIME_ZONE || DEFAULT_TIME_ZONE,
+        conflictPolicy,
+    });
+
+    console.log(`  ${summary.fullSync ? 'Full' : 'Incremental'} sync`);
+    console.log(`  Calendar changes pulled: ${summary.remoteChanges}`);
+    console.log(`  Bookings checked: ${summary.bookingsChecked}`);
+    console.log(`  Inserted: ${summary.inserted}, patched: ${summary.patched}, restored: ${summary.restored}, deleted: ${summary.deleted}`);
+    console.log(`  Copied from calendar: ${summary.pulled}, unchanged: ${summary.unchanged}`);
+    console.log(`  API requests: ${summary.requests}`);
+
+    if (summary.conflicts.length > 0) {
+        console.log('\n⚠️  Conflicts:');
+        summary.conflicts.forEach(c => console.log(`  ${c.bookingId} → ${c.resolution}`));
+    }
+    if (summary.errors.length > 0) {
+        console.log('\n❌ Errors:');
+        summary.errors.forEach(e => console.log(`  ${e.bookingId}: ${e.status} ${JSON.stringify(e.message)}`));
+        process.exit(1);
+    }
+    console.log('\n✅ Calendar sync complete');
+}
+
+syncCalendar().catch(error => {
+    console.error('Calendar sync failed:', error);
+    process.exit(1);
+});
@@ -0,0 +1,49 @@
+import fs from 'fs';
+import path from 'path';
+import { execSync } from 'child_process';
+import { ROOT_DIR, RAW_COVERAGE_DIR, INDEX_PATH, mapCoverageEntries, addResourceDependencies } from './coverage-map.js';
+
+/**
+ * Fold the per-test coverage written by tests/support/coverage-fixture.js
+ * and tests/conftest.py into a single index keyed by test location. The
+ * Python side writes raw script coverage, which is mapped here.
+ */
+function buildIndex() {
+    if (!fs.existsSync(RAW_COVERAGE_DIR)) {
+        console.error('No coverage found. Run `npm run test:impact:collect` first.');
+        process.exit(1);
+    }
+
+    const revision = execSync('git rev-parse HEAD', { cwd: ROOT_DIR }).toString().trim();
+    const dirty = execSync('git status --porcelain --untracked-files=no', { cwd: ROOT_DIR }).toString().trim() !== '';
+    if (dirty) {
+        console.warn('⚠️  Working tree has uncommitted changes; line numbers may not match', revision);
+    }
+
+    const tests = {};
+    for (const name of fs.readdirSync(RAW_COVERAGE_DIR)) {
+        if (!name.endsWith('.json')) continue;
+        const record = JSON.parse(fs.readFileSync(path.join(RAW_COVERAGE_DIR, name), 'utf8'));
+        tests[`${record.file}:${record.line}`] = {
+            file: record.file,
+            line: record.line,
+            title: record.title,
+            sources: record.sources || addResourceDependencies(mapCoverageEntries(record.entries), record.resourceUrls),
+        };
+    }
+
+    const index = {
+        version: 1,
+        revision,
+        generatedAt: new Date().toISOString(),
+        tests,
+    };
+    fs.writeFileSync(INDEX_PATH, JSON.stringify(index, null, 2));
+
+    const files = new Set(Object.values(tests).flatMap(t => Object.keys(t.sources)));
+    console.log(`✅ Indexed ${Object.keys(tests).length} tests across ${files.size} source files`);
+    console.log(`   Revision: ${revision}`);
+    console.log(`   Written to ${path.relative(ROOT_DIR, INDEX_PATH)}`);
+}
+
+buildIndex();
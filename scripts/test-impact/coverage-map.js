@@ -0,0 +1,230 @@
+import fs from 'fs';
+import path from 'path';
+import crypto from 'crypto';
+import { fileURLToPath } from 'url';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+export const ROOT_DIR = path.resolve(__dirname, '..', '..');
+export const IMPACT_DIR = path.join(ROOT_DIR, '.test-impact');
+export const RAW_COVERAGE_DIR = path.join(IMPACT_DIR, 'coverage');
+export const INDEX_PATH = path.join(IMPACT_DIR, 'index.json');
+
+// Mirrors the app.get() HTML routes in server.js, which are matched before
+// the static mounts. Listed even when the file isn't in this checkout.
+const HTML_ROUTES = {
+    '/': 'index.html',
+    '/diving': 'diving/diving.html',
+    '/training': 'training/training.html',
+    '/detailing': 'detailing/detailing.html',
+    '/deliveries': 'deliveries/deliveries.html',
+    '/schedule': 'schedule/schedule.html',
+    '/admin': 'admin/admin.html',
+    '/admin/': 'admin/admin.html',
+    '/inventory': 'inventory/inventory.html',
+    '/inventory/': 'inventory/inventory.html',
+    '/booking': 'booking.html',
+};
+
+// A dependency on a file as a whole (HTML, CSS, images, inline scripts)
+const WHOLE_FILE = [[1, Number.MAX_SAFE_INTEGER]];
+
+// Mirrors the static mounts in server.js so a script URL can be traced back
+// to the file on disk that served it.
+const STATIC_MOUNTS = [
+    ['/admin', 'admin'],
+    ['/inventory', 'inventory'],
+    ['/diving', 'diving'],
+    ['/training', 'training'],
+    ['/detailing', 'detailing'],
+    ['/deliveries', 'deliveries'],
+    ['/schedule', 'schedule'],
+    ['/', 'public'],
+];
+
+function toRepoPath(absolutePath) {
+    return path.relative(ROOT_DIR, absolutePath).split(path.sep).join('/');
+}
+
+/**
+ * Resolve a URL loaded by the browser to a repo-relative path.
+ * Returns null for third-party URLs.
+ */
+export function resolveSourcePath(url) {
+    let parsed;
+    try {
+        parsed = new URL(url);
+    } catch {
+        return null;
+    }
+
+    if (parsed.protocol === 'file:') {
+        const filePath = fileURLToPath(parsed);
+        return filePath.startsWith(ROOT_DIR) ? toRepoPath(filePath) : null;
+    }
+
+    if (!['localhost', '127.0.0.1'].includes(parsed.hostname)) {
+        return null;
+    }
+
+    const pathname = decodeURIComponent(parsed.pathname);
+    if (HTML_ROUTES[pathname]) {
+        return HTML_ROUTES[pathname];
+    }
+
+    for (const [mount, dir] of STATIC_MOUNTS) {
+        if (mount !== '/' && pathname !== mount && !pathname.startsWith(mount + '/')) {
+            continue;
+        }
+        const relative = mount === '/' ? pathname : pathname.slice(mount.length);
+        const candidate = path.join(ROOT_DIR, dir, relative);
+        if (fs.existsSync(candidate) && fs.statSync(candidate).isFile()) {
+            return toRepoPath(candidate);
+        }
+    }
+
+    // Vite dev server serves straight from the repo root
+    const rootCandidate = path.join(ROOT_DIR, pathname);
+    if (fs.existsSync(rootCandidate) && fs.statSync(rootCandidate).isFile()) {
+        return toRepoPath(rootCandidate);
+    }
+    return null;
+}
+
+/**
+ * Turn V8 block coverage into the 1-based line ranges that actually executed.
+ * V8 reports nested ranges per function, so the innermost range wins.
+ */
+export function coveredLineRanges(source, functions) {
+    const executed = new Uint8Array(source.length);
+    const ranges = functions
+        .flatMap(fn => fn.ranges)
+        .sort((a, b) => a.startOffset - b.startOffset || b.endOffset - a.endOffset);
+
+    for (const range of ranges) {
+        executed.fill(range.count > 0 ? 1 : 0, range.startOffset, range.endOffset);
+    }
+
+    const lines = [];
+    let lineStart = 0;
+    let lineNumber = 1;
+    while (lineStart <= source.length) {
+        let lineEnd = source.indexOf('\n', lineStart);
+        if (lineEnd === -1) lineEnd = source.length;
+
+        if (executed.subarray(lineStart, lineEnd).includes(1)) {
+            const last = lines[lines.length - 1];
+            if (last && last[1] === lineNumber - 1) {
+                last[1] = lineNumber;
+            } else {
+                lines.push([lineNumber, lineNumber]);
+            }
+        }
+
+        lineStart = lineEnd + 1;
+        lineNumber++;
+    }
+    return lines;
+}
+
+/**
+ * Names of the functions that were entered at least once.
+ */
+export function coveredFunctionNames(functions) {
+    const names = new Set();
+    for (const fn of functions) {
+        if (fn.functionName && fn.ranges.length > 0 && fn.ranges[0].count > 0) {
+            names.add(fn.functionName);
+        }
+    }
+    return [...names].sort();
+}
+
+/**
+ * Collapse the entries returned by page.coverage.stopJSCoverage() into a
+ * per-file map of covered functions and lines.
+ */
+export function mapCoverageEntries(entries) {
+    const sources = {};
+    for (const entry of entries) {
+        const sourcePath = resolveSourcePath(entry.url);
+        if (!sourcePath || !entry.source) continue;
+
+        // Inline <script> offsets are relative to the tag, not the HTML file,
+        // so any edit to the page counts as a hit
+        const lines = /\.m?js$/.test(sourcePath)
+            ? coveredLineRanges(entry.source, entry.functions)
+            : WHOLE_FILE;
+        if (lines.length === 0) continue;
+
+        const existing = sources[sourcePath];
+        const functions = coveredFunctionNames(entry.functions);
+        sources[sourcePath] = existing
+            ? {
+                functions: [...new Set([...existing.functions, ...functions])].sort(),
+                lines: mergeLineRanges([...existing.lines, ...lines]),
+            }
+            : { functions, lines };
+    }
+    return sources;
+}
+
+export function mergeLineRanges(ranges) {
+    const sorted = [...ranges].sort((a, b) => a[0] - b[0]);
+    const merged = [];
+    for (const [start, end] of sorted) {
+        const last = merged[merged.length - 1];
+        if (last && start <= last[1] + 1) {
+            last[1] = Math.max(last[1], end);
+        } else {
+            merged.push([start, end]);
+        }
+    }
+    return merged;
+}
+
+export function rangesIntersect(a, b) {
+    let i = 0;
+    let j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i][1] < b[j][0]) {
+            i++;
+        } else if (b[j][1] < a[i][0]) {
+            j++;
+        } else {
+            return true;
+        }
+    }
+    return false;
+}
+
+/**
+ * Add whole-file dependencies for the non-script URLs a test loaded
+ * (pages, stylesheets, images, JSON), so edits to them select the test too.
+ */
+export function addResourceDependencies(sources, urls) {
+    for (const url of urls) {
+        const sourcePath = resolveSourcePath(url);
+        if (!sourcePath) continue;
+        sources[sourcePath] = { functions: sources[sourcePath]?.functions || [], lines: WHOLE_FILE };
+    }
+    return sources;
+}
+
+/**
+ * Persist one test's coverage so build-index.js can fold it into the index.
+ */
+export function writeTestCoverage(testInfo, entries, resourceUrls = []) {
+    const file = toRepoPath(testInfo.file);
+    const record = {
+        file,
+        line: testInfo.line,
+        title: testInfo.titlePath.slice(1).join(' > '),
+        sources: addResourceDependencies(mapCoverageEntries(entries), resourceUrls),
+    };
+
+    const name = crypto.createHash('sha1').update(`${file}:${testInfo.line} ${record.title}`).digest('hex');
+    fs.mkdirSync(RAW_COVERAGE_DIR, { recursive: true });
+    fs.writeFileSync(path.join(RAW_COVERAGE_DIR, `${name}.json`), JSON.stringify(record));
+}
@@ -0,0 +1,238 @@
+import fs from 'fs';
+import path from 'path';
+import { execFileSync, spawnSync } from 'child_process';
+import { fileURLToPath } from 'url';
+import { ROOT_DIR, INDEX_PATH, mergeLineRanges, rangesIntersect } from './coverage-map.js';
+
+// Changes to these affect every test, so the whole suite runs.
+const GLOBAL_TRIGGERS = [
+    'package.json',
+    'package-lock.json',
+    'playwright.config.js',
+    'server.js',
+    'tests/support/coverage-fixture.js',
+    'tests/conftest.py',
+];
+
+const SPEC_PATTERN = /^tests\/.*\.spec\.[cm]?[jt]sx?$/;
+
+// The pytest suite; tests/conftest.py records its coverage into the same index
+const PYTHON_TESTS = /^tests\/test_[^/]*\.py$/;
+
+const isTestFile = file => SPEC_PATTERN.test(file) || PYTHON_TESTS.test(file);
+
+// Changes that can't affect any test. Any other file that no indexed test
+// maps runs the full suite rather than nothing.
+const NEVER_EXECUTED = [/\.md$/i, /^\.test-impact\//];
+
+/**
+ * Every Playwright spec and Python test file on disk, as repo-relative paths.
+ */
+export function listSpecFiles(dir = path.join(ROOT_DIR, 'tests')) {
+    const specs = [];
+    for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+        const fullPath = path.join(dir, entry.name);
+        if (entry.isDirectory()) {
+            if (entry.name !== 'node_modules') specs.push(...listSpecFiles(fullPath));
+            continue;
+        }
+        const relative = path.relative(ROOT_DIR, fullPath).split(path.sep).join('/');
+        if (isTestFile(relative)) specs.push(relative);
+    }
+    return specs.sort();
+}
+
+/**
+ * Parse `git diff --unified=0` output into changed line ranges per file.
+ * Line numbers are on the old side of the diff so they line up with the
+ * revision the index was built from. Binary files carry no hunks and are
+ * recorded with no ranges, i.e. as entirely changed.
+ */
+export function parseChangedLines(diffText) {
+    const changes = {};
+    let current = null;
+    let inHunk = false;
+
+    for (const line of diffText.split('\n')) {
+        const fileHeader = line.match(/^diff --git a\/(.+) b\/.+$/);
+        if (fileHeader) {
+            current = fileHeader[1];
+            inHunk = false;
+            continue;
+        }
+
+        const hunk = line.match(/^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@/);
+        if (hunk) {
+            inHunk = true;
+            if (current === null) continue;
+            const start = Number(hunk[1]);
+            const count = hunk[2] === undefined ? 1 : Number(hunk[2]);
+            changes[current] = changes[current] || [];
+            // Pure insertions sit between two lines; treat both neighbours as touched
+            changes[current].push(count === 0 ? [start, start + 1] : [start, start + count - 1]);
+            continue;
+        }
+        // Inside a hunk, `--- x` is a removed line starting with `-- `, not a header
+        if (inHunk) continue;
+
+        if (line.startsWith('--- ')) {
+            current = line === '--- /dev/null' ? null : line.slice(6);
+        } else if (line.startsWith('+++ ')) {
+            if (current === null && line !== '+++ /dev/null') {
+                current = line.slice(6);
+            }
+            if (current !== null) {
+                changes[current] = changes[current] || [];
+            }
+        } else if (line.startsWith('Binary files ') && current !== null) {
+            changes[current] = [];
+        }
+    }
+
+    for (const file of Object.keys(changes)) {
+        changes[file] = mergeLineRanges(changes[file]);
+    }
+    return changes;
+}
+
+/**
+ * Pick the tests whose recorded coverage overlaps the changed lines, plus
+ * every spec in `specFiles` the index knows nothing about.
+ * Returns { all: true, reason } when the change can't be narrowed down.
+ */
+export function selectTests(index, changes, specFiles = []) {
+    const changedFiles = Object.keys(changes);
+    const trigger = changedFiles.find(file => GLOBAL_TRIGGERS.includes(file));
+    if (trigger) {
+        return { all: true, reason: `${trigger} changed` };
+    }
+
+    const entries = Object.values(index.tests);
+    const mappedFiles = new Set(entries.flatMap(entry => Object.keys(entry.sources)));
+    const unmapped = changedFiles.find(file =>
+        !isTestFile(file) &&
+        !mappedFiles.has(file) &&
+        !NEVER_EXECUTED.some(pattern => pattern.test(file))
+    );
+    if (unmapped) {
+        return { all: true, reason: `${unmapped} changed and no indexed test maps it` };
+    }
+
+    const indexedSpecs = new Set(entries.map(entry => entry.file));
+    const reasons = {};
+    for (const spec of changedFiles.filter(isTestFile)) {
+        reasons[spec] = ['spec changed'];
+    }
+    for (const spec of specFiles.filter(file => !indexedSpecs.has(file) && !reasons[file])) {
+        reasons[spec] = ['not in index'];
+    }
+    const wholeSpecs = new Set(Object.keys(reasons));
+    const selected = [...wholeSpecs];
+
+    for (const [location, entry] of Object.entries(index.tests)) {
+        if (wholeSpecs.has(entry.file)) continue;
+
+        // Tests that drive their own browser record nothing, so always run them
+        if (Object.keys(entry.sources).length === 0) {
+            selected.push(location);
+            reasons[location] = ['no coverage recorded'];
+            continue;
+        }
+
+        const hits = [];
+        for (const [file, coverage] of Object.entries(entry.sources)) {
+            const changed = changes[file];
+            if (!changed) continue;
+            // Untracked files carry no hunks, so treat them as entirely changed
+            if (changed.length === 0 || rangesIntersect(coverage.lines, changed)) {
+                hits.push(file);
+            }
+        }
+
+        if (hits.length > 0) {
+            selected.push(location);
+            reasons[location] = hits;
+        }
+    }
+
+    return { all: false, selected, reasons };
+}
+
+function readIndex() {
+    if (!fs.existsSync(INDEX_PATH)) {
+        console.error(`No test impact index at ${path.relative(ROOT_DIR, INDEX_PATH)}.`);
+        console.error('Run `npm run test:impact:collect && npm run test:impact:index` first.');
+        process.exit(1);
+    }
+    return JSON.parse(fs.readFileSync(INDEX_PATH, 'utf8'));
+}
+
+function collectChanges(since) {
+    const diff = execFileSync('git', ['diff', '--unified=0', '--no-color', '--no-renames', since, '--'], {
+        cwd: ROOT_DIR,
+        maxBuffer: 64 * 1024 * 1024,
+    }).toString();
+    const changes = parseChangedLines(diff);
+
+    // New specs aren't in the diff until they're staged
+    const untracked = execFileSync('git', ['ls-files', '--others', '--exclude-standard', 'tests'], { cwd: ROOT_DIR })
+        .toString()
+        .split('\n')
+        .filter(isTestFile);
+    for (const file of untracked) {
+        changes[file] = [];
+    }
+    return changes;
+}
+
+function main(argv) {
+    const args = argv.slice(2);
+    const sinceIndex = args.indexOf('--since');
+    const run = args.includes('--run');
+    const verbose = args.includes('--verbose');
+
+    const index = readIndex();
+    const since = sinceIndex !== -1 ? args[sinceIndex + 1] : index.revision;
+    const result = selectTests(index, collectChanges(since), listSpecFiles());
+    const total = Object.keys(index.tests).length;
+
+    if (result.all) {
+        console.error(`Running full suite: ${result.reason}`);
+    } else {
+        console.error(`Selected ${result.selected.length} of ${total} indexed tests (changes since ${since})`);
+        for (const location of result.selected) {
+            console.log(verbose ? `${location}  ← ${result.reasons[location].join(', ')}` : location);
+        }
+    }
+
+    if (!run) return;
+
+    // Whole specs are listed by path, single tests as path:line
+    const fileOf = location => location.replace(/:\d+$/, '');
+    const selected = result.all ? [] : result.selected;
+    const playwrightTests = selected.filter(location => SPEC_PATTERN.test(fileOf(location)));
+    // Each Python test file holds a single test, so run the file
+    const pythonTests = result.all
+        ? listSpecFiles().filter(file => PYTHON_TESTS.test(file))
+        : [...new Set(selected.map(fileOf).filter(file => PYTHON_TESTS.test(file)))];
+
+    let status = 0;
+    if (result.all || playwrightTests.length > 0) {
+        const playwrightArgs = ['playwright', 'test', ...playwrightTests];
+        status = spawnSync('npx', playwrightArgs, { cwd: ROOT_DIR, stdio: 'inherit' }).status ?? 1;
+    } else {
+        console.error('No Playwright tests selected.');
+    }
+
+    if (pythonTests.length > 0) {
+        const pytest = spawnSync('python', ['-m', 'pytest', '-q', ...pythonTests], { cwd: ROOT_DIR, stdio: 'inherit' });
+        status = status || (pytest.status ?? 1);
+    } else {
+        console.error('No Python tests selected.');
+    }
+    process.exit(status);
+}
+
+if (process.argv[1] === fileURLToPath(import.meta.url)) {
+    main(process.argv);
+}
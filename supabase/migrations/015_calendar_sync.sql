@@ -0,0 +1,65 @@
+-- ============================================
+-- Migration 015: Incremental Google Calendar Sync
+-- ============================================
+-- Supports api/calendar-sync.js, which reconciles bookings with
+-- Google Calendar using incremental sync tokens and batched requests.
+--
+-- - bookings.updated_at is now maintained by a trigger so the sync
+--   can pick up only rows changed since its last run. Writes that
+--   only touch the calendar bookkeeping columns leave it alone, so
+--   the sync doesn't re-read its own writebacks.
+-- - google_event_etag / google_event_hash record what was last pushed,
+--   to recognise our own changes in the calendar feed and skip
+--   bookings whose calendar-facing fields haven't changed.
+-- - calendar_sync_state keeps the sync token and watermark per calendar.
+-- ============================================
+
+ALTER TABLE bookings
+ADD COLUMN IF NOT EXISTS google_event_etag TEXT;
+
+ALTER TABLE bookings
+ADD COLUMN IF NOT EXISTS google_event_hash TEXT;
+
+ALTER TABLE bookings
+ADD COLUMN IF NOT EXISTS google_synced_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_bookings_updated_at ON bookings(updated_at);
+CREATE INDEX IF NOT EXISTS idx_bookings_google_event_id ON bookings(google_event_id);
+
+-- Bump updated_at unless only the calendar sync columns changed
+CREATE OR REPLACE FUNCTION update_bookings_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF (to_jsonb(NEW) - ARRAY['google_event_id', 'google_event_etag', 'google_event_hash', 'google_synced_at', 'updated_at'])
+       IS DISTINCT FROM
+       (to_jsonb(OLD) - ARRAY['google_event_id', 'google_event_etag', 'google_event_hash', 'google_synced_at', 'updated_at']) THEN
+        NEW.updated_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS update_bookings_updated_at ON bookings;
+CREATE TRIGGER update_bookings_updated_at BEFORE UPDATE ON bookings
+    FOR EACH ROW EXECUTE FUNCTION update_bookings_updated_at();
+
+CREATE TABLE IF NOT EXISTS calendar_sync_state (
+  calendar_id TEXT PRIMARY KEY,
+  sync_token TEXT,
+  bookings_synced_through TIMESTAMP WITH TIME ZONE,
+  last_run_at TIMESTAMP WITH TIME ZONE,
+  last_run_summary JSONB,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Only the service role (the sync job) touches sync state
+ALTER TABLE calendar_sync_state ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON COLUMN bookings.google_event_etag IS 'ETag of the calendar event as last written by the sync';
+COMMENT ON COLUMN bookings.google_event_hash IS 'Hash of the calendar-facing booking fields last pushed';
+COMMENT ON COLUMN calendar_sync_state.sync_token IS 'Calendar events.list sync token; not advanced past a calendar change whose write failed';
+COMMENT ON COLUMN calendar_sync_state.bookings_synced_through IS 'bookings.updated_at watermark for the next run';
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
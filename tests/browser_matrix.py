@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Run the estimator scenarios across browsers and viewports concurrently.
+
+Every browser/viewport/scenario combination gets its own context, and all
+of them share one event loop, so the full matrix takes about as long as
+the slowest single browser.
+
+    python tests/browser_matrix.py
+    python tests/browser_matrix.py --browsers chromium webkit --viewports mobile
+    python tests/browser_matrix.py --headed --slow-mo 250
+"""
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass, field
+
+from playwright.async_api import async_playwright
+
+BASE_URL = "http://localhost:8082"
+BROWSERS = ("chromium", "webkit", "firefox")
+
+# Device descriptors from Playwright's registry; None keeps the default desktop context
+VIEWPORTS = {
+    "desktop": None,
+    "mobile": "iPhone 13",
+}
+
+
+async def visible_step(page):
+    for i in range(9):  # 0-8
+        if await page.locator(f'#step-{i}').is_visible():
+            return i
+    return None
+
+
+async def walk_to_estimate(page, service_key, steps):
+    await page.click(f'[data-service-key="{service_key}"]')
+    for _ in range(steps):
+        await page.click('#nextButton')
+        await page.wait_for_timeout(100)
+
+    # View Estimate
+    await page.click('#nextButton')
+    await page.wait_for_timeout(500)
+
+
+async def view_estimate_per_foot(page):
+    await walk_to_estimate(page, "onetime_cleaning", 7)
+    assert await visible_step(page) == 8, "did not reach results page"
+
+    cost = await page.locator('#totalCostDisplay').text_content()
+    assert cost and cost.strip(), "no total cost displayed"
+
+    # Button becomes Start Over on the results page
+    await page.click('#nextButton')
+    await page.wait_for_timeout(500)
+    assert await visible_step(page) == 0, "Start Over did not return to service selection"
+
+
+async def view_estimate_flat_rate(page):
+    # Item recovery skips the anodes step; the first Next goes straight to results
+    await walk_to_estimate(page, "item_recovery", 0)
+    assert await visible_step(page) == 8, "did not reach results page"
+
+    cost = await page.locator('#totalCostDisplay').text_content()
+    assert cost and cost.strip(), "no total cost displayed"
+
+
+async def checkout_intervals_recurring(page):
+    await walk_to_estimate(page, "recurring_cleaning", 7)
+    await page.click('#checkout-button')
+    await page.wait_for_timeout(500)
+
+    assert await page.locator('#service-interval-section').is_visible(), \
+        "interval section hidden for recurring service"
+    assert await page.locator('.interval-option').count() > 0, "no interval options"
+
+
+async def checkout_intervals_onetime(page):
+    await walk_to_estimate(page, "onetime_cleaning", 7)
+    await page.click('#checkout-button')
+    await page.wait_for_timeout(500)
+
+    assert not await page.locator('#service-interval-section').is_visible(), \
+        "interval section visible for one-time service"
+
+
+SCENARIOS = {
+    "view_estimate_per_foot": view_estimate_per_foot,
+    "view_estimate_flat_rate": view_estimate_flat_rate,
+    "checkout_intervals_recurring": checkout_intervals_recurring,
+    "checkout_intervals_onetime": checkout_intervals_onetime,
+}
+
+
+@dataclass
+class Result:
+    browser: str
+    viewport: str
+    scenario: str
+    passed: bool
+    duration: float
+    error: str = ""
+
+
+@dataclass
+class BrowserSummary:
+    browser: str
+    results: list = field(default_factory=list)
+
+    @property
+    def passed(self):
+        return sum(r.passed for r in self.results)
+
+    @property
+    def failed(self):
+        return len(self.results) - self.passed
+
+    @property
+    def duration(self):
+        return max((r.duration for r in self.results), default=0.0)
+
+
+def context_options(p, browser_name, viewport):
+    device = VIEWPORTS[viewport]
+    if device is None:
+        return {}
+
+    options = dict(p.devices[device])
+    options.pop("default_browser_type", None)
+    if browser_name == "firefox":
+        # Firefox has no mobile emulation; keep the viewport, UA and scale only
+        options.pop("is_mobile", None)
+        options.pop("has_touch", None)
+    return options
+
+
+async def run_scenario(p, browser, browser_name, viewport, name, args, semaphore):
+    async with semaphore:
+        start = time.perf_counter()
+        context = None
+
+        try:
+            context = await browser.new_context(**context_options(p, browser_name, viewport))
+            page = await context.new_page()
+            if args.console:
+                page.on("console", lambda msg: print(f"[{browser_name}/{viewport}/{name}] {msg.text}"))
+
+            await page.goto(args.base_url)
+            await SCENARIOS[name](page)
+            result = Result(browser_name, viewport, name, True, time.perf_counter() - start)
+        except Exception as e:
+            result = Result(browser_name, viewport, name, False, time.perf_counter() - start, str(e).splitlines()[0])
+        finally:
+            if context is not None:
+                await context.close()
+
+        mark = "✓" if result.passed else "✗"
+        print(f"{mark} {browser_name:<8} {viewport:<7} {name} ({result.duration:.1f}s)")
+        return result
+
+
+async def run_browser(p, browser_name, args):
+    summary = BrowserSummary(browser_name)
+    launch_options = {"headless": not args.headed}
+    if args.slow_mo:
+        launch_options["slow_mo"] = args.slow_mo
+
+    try:
+        browser = await getattr(p, browser_name).launch(**launch_options)
+    except Exception as e:
+        message = f"launch failed: {str(e).splitlines()[0]}"
+        print(f"✗ {browser_name:<8} {message}")
+        summary.results = [
+            Result(browser_name, viewport, name, False, 0.0, message)
+            for viewport in args.viewports
+            for name in args.scenarios
+        ]
+        return summary
+
+    semaphore = asyncio.Semaphore(args.workers)
+    try:
+        summary.results = await asyncio.gather(*[
+            run_scenario(p, browser, browser_name, viewport, name, args, semaphore)
+            for viewport in args.viewports
+            for name in args.scenarios
+        ])
+        if args.headed and args.hold:
+            print(f"\n⚠️  {browser_name} will close in {args.hold} seconds...")
+            await asyncio.sleep(args.hold)
+    finally:
+        await browser.close()
+    return summary
+
+
+def print_summary(summaries, elapsed):
+    print("\n=== Cross-browser Summary ===")
+    for summary in summaries:
+        print(f"{summary.browser:<8} {summary.passed} passed, {summary.failed} failed "
+              f"(slowest {summary.duration:.1f}s)")
+        for r in summary.results:
+            if not r.passed:
+                print(f"    ✗ {r.viewport}/{r.scenario}: {r.error}")
+    print(f"\nTotal wall-clock time: {elapsed:.1f}s")
+
+
+async def run_matrix(args):
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        summaries = await asyncio.gather(*[run_browser(p, name, args) for name in args.browsers])
+    print_summary(summaries, time.perf_counter() - start)
+    return summaries
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run estimator scenarios across browsers concurrently.")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--browsers", nargs="+", choices=BROWSERS, default=list(BROWSERS))
+    parser.add_argument("--viewports", nargs="+", choices=list(VIEWPORTS), default=list(VIEWPORTS))
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--workers", type=int, default=4, help="concurrent contexts per browser")
+    parser.add_argument("--headed", action="store_true", help="show the browsers for debugging")
+    parser.add_argument("--slow-mo", type=int, default=0, help="delay each action by N ms")
+    parser.add_argument("--hold", type=int, default=0, help="keep headed browsers open N seconds")
+    parser.add_argument("--console", action="store_true", help="echo browser console output")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    summaries = asyncio.run(run_matrix(parse_args()))
+    sys.exit(0 if all(s.failed == 0 for s in summaries) else 1)
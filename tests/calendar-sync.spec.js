@@ -0,0 +1,259 @@
+import { test, expect } from '@playwright/test';
+import { createCalendarClient } from '../api/calendar-client.js';
+import { syncBookingsWithCalendar, bookingEventId } from '../api/calendar-sync.js';
+import { startFakeCalendarServer } from './support/fake-calendar-server.js';
+
+const CALENDAR_ID = 'bookings@sailorskills.test';
+
+// Columns the migration 015 trigger ignores when bumping updated_at
+const SYNC_COLUMNS = ['google_event_id', 'google_event_etag', 'google_event_hash', 'google_synced_at'];
+
+function createMemoryStore(rows) {
+    const bookings = new Map(rows.map(row => [row.id, { ...row }]));
+    let state = null;
+
+    return {
+        bookings,
+        async getState() {
+            return state;
+        },
+        async saveState(calendarId, next) {
+            state = { ...state, ...next };
+        },
+        async changedBookings(since) {
+            return [...bookings.values()].filter(row => !since || row.updated_at > since).map(row => ({ ...row }));
+        },
+        async bookingsByIds(ids) {
+            return ids.filter(id => bookings.has(id)).map(id => ({ ...bookings.get(id) }));
+        },
+        async updateBookings(updates) {
+            for (const { id, fields } of updates) {
+                this.edit(id, fields);
+            }
+        },
+        edit(id, fields) {
+            const row = bookings.get(id);
+            Object.assign(row, fields);
+            if (Object.keys(fields).some(key => !SYNC_COLUMNS.includes(key))) {
+                row.updated_at = new Date().toISOString();
+            }
+        },
+    };
+}
+
+function seasonOfBookings(count) {
+    return Array.from({ length: count }, (_, i) => {
+        const day = new Date(Date.UTC(2026, 3, 1) + i * 86400000).toISOString().slice(0, 10);
+        return {
+            id: `00000000-0000-4000-8000-${String(i).padStart(12, '0')}`,
+            customer_name: `Customer ${i}`,
+            customer_email: `customer${i}@example.com`,
+            booking_date: day,
+            start_time: '09:00:00',
+            end_time: '12:00:00',
+            participants: 1,
+            status: 'confirmed',
+            google_event_id: null,
+            service_types: { name: 'Training: Half Day' },
+            updated_at: new Date().toISOString(),
+        };
+    });
+}
+
+test.describe('Google Calendar booking sync', () => {
+    let calendar;
+    let store;
+    let client;
+
+    const sync = options => syncBookingsWithCalendar({ store, client, calendarId: CALENDAR_ID, ...options });
+
+    test.beforeEach(async () => {
+        calendar = await startFakeCalendarServer();
+        store = createMemoryStore(seasonOfBookings(120));
+        client = createCalendarClient({
+            calendarId: CALENDAR_ID,
+            baseUrl: calendar.baseUrl,
+            getAccessToken: async () => 'test-token',
+        });
+    });
+
+    test.afterEach(async () => {
+        await calendar.close();
+    });
+
+    test('first run creates a season of events in a few batched requests', async () => {
+        const summary = await sync();
+
+        expect(summary.inserted).toBe(120);
+        // One events.list plus ceil(120 / 50) batches
+        expect(summary.requests).toBe(4);
+        expect(calendar.events.size).toBe(120);
+        for (const booking of store.bookings.values()) {
+            expect(booking.google_event_id).toBe(bookingEventId(booking.id));
+        }
+    });
+
+    test.describe('after the initial sync', () => {
+        test.beforeEach(async () => {
+            await sync();
+            // The next feed holds the echoes of those inserts
+            await sync();
+        });
+
+        test('an unchanged calendar and booking table costs a single list request', async () => {
+            const summary = await sync();
+
+            expect(summary.requests).toBe(1);
+            expect(summary.remoteChanges).toBe(0);
+            expect(summary.inserted + summary.patched + summary.deleted).toBe(0);
+        });
+
+        test('only bookings whose calendar fields changed are written', async () => {
+            const [first, second, third, fourth] = store.bookings.keys();
+            store.edit(first, { start_time: '10:00:00', end_time: '13:00:00' });
+            store.edit(second, { notes: 'Bring foul weather gear' });
+            store.edit(third, { status: 'cancelled' });
+            // Not calendar-facing: bumps updated_at but shouldn't cost a request
+            store.edit(fourth, { reminder_sent_at: new Date().toISOString() });
+
+            const summary = await sync();
+
+            expect(summary).toMatchObject({ patched: 2, deleted: 1, inserted: 0 });
+            expect(summary.requests).toBe(2);
+            expect(calendar.events.get(bookingEventId(first)).start.dateTime).toBe('2026-04-01T10:00:00');
+            expect(calendar.events.get(bookingEventId(third)).status).toBe('cancelled');
+            expect(store.bookings.get(third).google_event_id).toBeNull();
+
+            // Our own writes come back through the feed and are recognised
+            const echo = await sync();
+            expect(echo.remoteChanges).toBe(3);
+            expect(echo.requests).toBe(1);
+        });
+
+        test('conflicting edits are settled by the conflict policy', async () => {
+            const [localWins, remoteWins] = store.bookings.keys();
+            store.edit(localWins, { start_time: '08:00:00' });
+            calendar.editEvent(bookingEventId(localWins), { start: { dateTime: '2026-04-01T07:00:00-07:00' } });
+
+            const local = await sync();
+            expect(local.conflicts).toEqual([
+                expect.objectContaining({ bookingId: localWins, resolution: 'local' }),
+            ]);
+            expect(calendar.events.get(bookingEventId(localWins)).start.dateTime).toBe('2026-04-01T08:00:00');
+
+            store.edit(remoteWins, { notes: 'Changed here too' });
+            calendar.editEvent(bookingEventId(remoteWins), {
+                start: { dateTime: '2026-04-02T14:00:00-07:00' },
+                end: { dateTime: '2026-04-02T17:00:00-07:00' },
+            });
+
+            const remote = await sync({ conflictPolicy: 'remote' });
+            expect(remote.conflicts).toEqual([
+                expect.objectContaining({ bookingId: remoteWins, resolution: 'remote' }),
+            ]);
+            expect(store.bookings.get(remoteWins)).toMatchObject({ start_time: '14:00:00', end_time: '17:00:00' });
+            expect(remote.requests).toBe(1);
+        });
+
+        test('calendar edits to fields the sync does not own are left alone', async () => {
+            const [id] = store.bookings.keys();
+            calendar.editEvent(bookingEventId(id), {
+                colorId: '5',
+                attendees: [{ email: 'crew@example.com' }],
+                // Same time, reported with an offset the way Google does
+                start: { dateTime: '2026-04-01T09:00:00-07:00', timeZone: 'America/Los_Angeles' },
+            });
+
+            const summary = await sync();
+
+            expect(summary).toMatchObject({ remoteChanges: 1, patched: 0, pulled: 0, conflicts: [] });
+            expect(summary.requests).toBe(1);
+            expect(calendar.events.get(bookingEventId(id)).colorId).toBe('5');
+
+            // The new etag was recorded, so the edit isn't seen again
+            expect((await sync()).remoteChanges).toBe(0);
+        });
+
+        test('events deleted in the calendar are restored for live bookings', async () => {
+            const [id] = store.bookings.keys();
+            calendar.editEvent(bookingEventId(id), { colorId: '3', attendees: [{ email: 'crew@example.com' }] });
+            calendar.deleteEvent(bookingEventId(id));
+
+            const summary = await sync();
+
+            expect(summary.restored).toBe(1);
+            expect(calendar.events.get(bookingEventId(id))).toMatchObject({
+                status: 'confirmed',
+                colorId: '3',
+                attendees: [{ email: 'crew@example.com' }],
+            });
+        });
+
+        test('a calendar edit whose write fails is retried on the next run', async () => {
+            const [id] = store.bookings.keys();
+            // Months old: the failure must not drag the watermark back to it
+            store.bookings.get(id).updated_at = '2026-01-01T00:00:00.000Z';
+            const { sync_token: tokenBefore } = await store.getState(CALENDAR_ID);
+            calendar.editEvent(bookingEventId(id), { start: { dateTime: '2026-04-01T07:00:00-07:00' } });
+            calendar.failNextBatch(503);
+
+            const failed = await sync();
+
+            expect(failed.errors).toEqual([expect.objectContaining({ bookingId: id, status: 503 })]);
+            const state = await store.getState(CALENDAR_ID);
+            expect(state.sync_token).toBe(tokenBefore);
+            expect(Date.parse(state.bookings_synced_through)).toBeGreaterThan(Date.parse('2026-01-01T00:00:00.000Z'));
+
+            const retried = await sync();
+
+            expect(retried.patched).toBe(1);
+            expect(retried.errors).toEqual([]);
+            expect(calendar.events.get(bookingEventId(id)).start.dateTime).toBe('2026-04-01T09:00:00');
+        });
+
+        test('an expired sync token falls back to a full sync without rewriting events', async () => {
+            calendar.expireSyncTokens();
+
+            const summary = await sync();
+
+            expect(summary.fullSync).toBe(true);
+            expect(summary.bookingsChecked).toBe(120);
+            expect(summary.inserted + summary.patched).toBe(0);
+            // 410 on the incremental list, then one full page per 250 events
+            expect(summary.requests).toBe(2);
+        });
+
+        test('an event purged from the calendar is recreated under the booking id', async () => {
+            const [legacy, purged, taken] = store.bookings.keys();
+            // Linked to an older server-assigned event that no longer exists
+            calendar.events.delete(bookingEventId(legacy));
+            store.edit(legacy, { google_event_id: 'srvlegacy', notes: 'Moved' });
+            // Linked to its own id, which can't be reused once purged
+            calendar.events.delete(bookingEventId(purged));
+            store.edit(purged, { notes: 'Moved too' });
+            // Linked elsewhere while its own id is already taken
+            store.edit(taken, { google_event_id: 'srvother', notes: 'Moved as well' });
+
+            const summary = await sync();
+
+            expect(summary.inserted).toBe(3);
+            expect(summary.errors).toEqual([]);
+            expect(store.bookings.get(legacy).google_event_id).toBe(bookingEventId(legacy));
+            expect(store.bookings.get(purged).google_event_id).toMatch(/^srv/);
+            expect(store.bookings.get(taken).google_event_id).toMatch(/^srv/);
+            expect(calendar.events.get(bookingEventId(legacy)).description).toContain('Notes: Moved');
+        });
+
+        test('a lost writeback is recovered without duplicating the event', async () => {
+            const [id] = store.bookings.keys();
+            store.edit(id, { google_event_id: null, google_event_etag: null, google_event_hash: null, notes: 'Retry me' });
+
+            const summary = await sync();
+
+            expect(summary.patched).toBe(1);
+            expect(summary.errors).toEqual([]);
+            expect(calendar.events.size).toBe(120);
+            expect(store.bookings.get(id).google_event_id).toBe(bookingEventId(id));
+        });
+    });
+});
@@ -0,0 +1,94 @@
+"""Test impact coverage for the Python browser tests.
+
+Set TEST_IMPACT_COVERAGE=1 to record which scripts, pages and assets each
+test loads, in the same per-test format as tests/support/coverage-fixture.js.
+The tests launch their own Chromium, so Browser.new_page and Browser.close
+are wrapped: coverage starts over CDP when a page opens and is taken just
+before the browser closes. A test that fails before closing its browser
+records nothing and is always selected.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Browser, Error
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RAW_COVERAGE_DIR = ROOT_DIR / ".test-impact" / "coverage"
+
+COLLECT_COVERAGE = bool(os.environ.get("TEST_IMPACT_COVERAGE"))
+
+
+def take_coverage(session):
+    """Script coverage for one page, shaped like page.coverage.stopJSCoverage()."""
+    entries = []
+    for script in session.send("Profiler.takePreciseCoverage")["result"]:
+        if not script["url"].startswith("http"):
+            continue
+        try:
+            source = session.send("Debugger.getScriptSource", {"scriptId": script["scriptId"]})["scriptSource"]
+        except Error:
+            # Collected after a navigation; the page itself still counts via its response
+            continue
+        entries.append({"url": script["url"], "source": source, "functions": script["functions"]})
+    return entries
+
+
+@pytest.fixture(autouse=True)
+def impact_coverage(request, monkeypatch):
+    if not COLLECT_COVERAGE:
+        yield
+        return
+
+    pages = []
+    entries = []
+    resource_urls = set()
+    closed = []
+    original_new_page = Browser.new_page
+    original_close = Browser.close
+
+    def on_response(response):
+        # Scripts get line-level coverage; everything else counts as a whole file
+        if response.request.resource_type != "script":
+            resource_urls.add(response.url)
+
+    def new_page(self, *args, **kwargs):
+        page = original_new_page(self, *args, **kwargs)
+        if self.browser_type.name == "chromium":
+            session = page.context.new_cdp_session(page)
+            session.send("Profiler.enable")
+            session.send("Profiler.startPreciseCoverage", {"callCount": True, "detailed": True})
+            session.send("Debugger.enable")
+            page.on("response", on_response)
+            pages.append((page, session))
+        return page
+
+    def close(self, *args, **kwargs):
+        for page, session in pages:
+            if page.context.browser is self and not page.is_closed():
+                entries.extend(take_coverage(session))
+        closed.append(self)
+        return original_close(self, *args, **kwargs)
+
+    monkeypatch.setattr(Browser, "new_page", new_page)
+    monkeypatch.setattr(Browser, "close", close)
+
+    yield
+
+    if not pages or not closed:
+        return
+
+    path, line, _ = request.node.location
+    file = Path(request.config.rootpath, path).resolve().relative_to(ROOT_DIR).as_posix()
+    record = {
+        "file": file,
+        "line": line + 1,
+        "title": request.node.name,
+        "entries": entries,
+        "resourceUrls": sorted(resource_urls),
+    }
+    name = hashlib.sha1(f"{file}:{record['line']} {record['title']}".encode()).hexdigest()
+    RAW_COVERAGE_DIR.mkdir(parents=True, exist_ok=True)
+    (RAW_COVERAGE_DIR / f"{name}.json").write_text(json.dumps(record))
@@ -1,4 +1,4 @@
-import { test } from '@playwright/test';
+import { test } from '../support/coverage-fixture.js';
 
 test('Check for 404 errors', async ({ page }) => {
     // Track network requests
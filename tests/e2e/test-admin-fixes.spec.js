@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Admin Page Anode and Price Customization Tests', () => {
     test('Anode quantity updates and price customization work correctly', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Complete Anode Selection Flow', () => {
     test('Comprehensive test of anode selection, counter, and price customization', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Debug Anode Counter Issue', () => {
     test('Thoroughly test anode selection and counter updates', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Anode Counter Direct Test', () => {
     test('Test anode counter updates when clicking plus/minus', async ({ page }) => {
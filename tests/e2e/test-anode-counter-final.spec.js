@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Anode Counter Final Test', () => {
     test('Comprehensive test of anode counter functionality', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Anode Counter with Scrolling', () => {
     test('Test anode counter with proper scrolling', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Anode Details Section', () => {
     test('should show anode details field for Anodes Only service', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('FINAL TEST: Verify anode details section shows for Anodes Only', async ({ page }) => {
     // Capture console logs
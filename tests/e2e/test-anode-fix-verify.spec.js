@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Verify anode details section shows for Anodes Only service', async ({ page }) => {
     // Capture console logs
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Anode Picker Functionality Tests', () => {
     test.beforeEach(async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Anode Quantity Update Test', () => {
     test('Anode quantity should update immediately when clicking + or - buttons', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Test anode details section visibility with full debugging', async ({ page }) => {
     // Capture ALL console messages
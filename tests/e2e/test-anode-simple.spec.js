@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Simple anode picker test', async ({ page }) => {
     // Navigate to admin page
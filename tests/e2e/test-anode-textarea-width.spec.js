@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Verify anode details textarea is full width', async ({ page }) => {
     // Navigate to diving page
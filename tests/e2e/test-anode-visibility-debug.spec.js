@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Debug anode details visibility step by step', async ({ page }) => {
     // Navigate and select Anodes Only service
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Test anode picker complete workflow', async ({ page }) => {
     // Navigate to admin page
@@ -1,4 +1,4 @@
-import { test } from '@playwright/test';
+import { test } from '../support/coverage-fixture.js';
 
 test('Debug service button clicks', async ({ page }) => {
     // Capture console messages
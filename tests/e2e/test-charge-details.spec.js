@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Verify charge summary shows all boat and pricing details', async ({ page }) => {
     await page.goto('http://localhost:3000/admin');
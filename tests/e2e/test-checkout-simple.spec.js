@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Test showCheckout logs', async ({ page }) => {
     // Capture ALL console messages
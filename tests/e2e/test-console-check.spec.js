@@ -1,4 +1,4 @@
-import { test } from '@playwright/test';
+import { test } from '../support/coverage-fixture.js';
 
 test('Check console for errors and adminApp', async ({ page }) => {
     // Capture ALL console messages
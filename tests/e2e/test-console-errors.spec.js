@@ -1,4 +1,4 @@
-import { test } from '@playwright/test';
+import { test } from '../support/coverage-fixture.js';
 
 test('Check for console errors when clicking service', async ({ page }) => {
     // Capture ALL console messages
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Verify consolidated charge summary displays pricing details', async ({ page }) => {
     await page.goto('http://localhost:3000/admin');
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Debug Anode Grids', () => {
     test('Debug why anode grids are not visible', async ({ page }) => {
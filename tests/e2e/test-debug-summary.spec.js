@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Debug charge summary display issue', async ({ page }) => {
     // Add console listener to capture any JavaScript errors
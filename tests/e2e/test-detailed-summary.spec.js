@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Verify detailed charge summary display', async ({ page }) => {
     await page.goto('http://localhost:3000/admin');
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Direct check of showCheckout execution', async ({ page }) => {
     // Navigate and inject code to trace execution
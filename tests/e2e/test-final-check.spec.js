@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Final check - All service wizards working', async ({ page }) => {
     // Capture console logs
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Find Anode Button', () => {
     test('Find and click the Add Anodes button', async ({ page }) => {
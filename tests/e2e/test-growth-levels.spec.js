@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Verify new granular growth levels', async ({ page }) => {
     await page.goto('http://localhost:3000/admin');
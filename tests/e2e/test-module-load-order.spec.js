@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Test module load order and showCheckout availability', async ({ page }) => {
     // Navigate to diving page
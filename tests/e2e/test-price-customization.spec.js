@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Price Customization and Anode Quantity Tests', () => {
     test('Anode quantity should update immediately and price customization should work', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test.describe('Debug Quantity Display', () => {
     test('Debug why quantity display is not updating', async ({ page }) => {
@@ -1,4 +1,4 @@
-import { test } from '@playwright/test';
+import { test } from '../support/coverage-fixture.js';
 
 test('Take screenshot after clicking service', async ({ page }) => {
     await page.goto('http://localhost:3000/admin');
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from '../support/coverage-fixture.js';
 
 test('Debug showCheckout function execution', async ({ page }) => {
     // Inject our own debug logging
@@ -0,0 +1,172 @@
+import { test, expect } from '@playwright/test';
+import fs from 'fs';
+import http from 'http';
+import path from 'path';
+import { spawn } from 'child_process';
+import { fileURLToPath } from 'url';
+import { summarizePage, rankAssets, checkBudgets, crawl, parseArgs } from '../scripts/analyze/page-weight.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const ROOT_DIR = path.resolve(__dirname, '..');
+const PHOTO = fs.readFileSync(path.join(ROOT_DIR, 'public', 'sailing-photo.jpg'));
+const STYLESHEET = 'body { margin: 0; font-family: sans-serif; }';
+
+// A full-size photo squeezed into a thumbnail behind a blocking stylesheet
+const FIXTURE_PAGE = `<!DOCTYPE html>
+<html>
+<head><link rel="stylesheet" href="/blocking.css"></head>
+<body><h1>Fixture</h1><img src="/photo.jpg" style="width: 64px; height: 48px"></body>
+</html>`;
+
+/**
+ * Serve the fixture page on every HTML route, holding each page response
+ * briefly so the crawler's concurrency can be observed.
+ */
+async function startFixtureServer() {
+    let inFlight = 0;
+    const stats = { maxInFlight: 0 };
+
+    const server = http.createServer(async (req, res) => {
+        if (req.url === '/blocking.css') {
+            res.writeHead(200, { 'Content-Type': 'text/css' });
+            return res.end(STYLESHEET);
+        }
+        if (req.url === '/photo.jpg') {
+            res.writeHead(200, { 'Content-Type': 'image/jpeg' });
+            return res.end(PHOTO);
+        }
+
+        inFlight++;
+        stats.maxInFlight = Math.max(stats.maxInFlight, inFlight);
+        await new Promise(resolve => setTimeout(resolve, 300));
+        inFlight--;
+        res.writeHead(200, { 'Content-Type': 'text/html' });
+        res.end(FIXTURE_PAGE);
+    });
+
+    await new Promise(resolve => server.listen(0, '127.0.0.1', resolve));
+    return {
+        baseUrl: `http://127.0.0.1:${server.address().port}`,
+        stats,
+        close: () => new Promise(resolve => server.close(resolve)),
+    };
+}
+
+function runCli(args) {
+    return new Promise(resolve => {
+        const child = spawn(process.execPath, [path.join(ROOT_DIR, 'scripts', 'analyze', 'page-weight.js'), ...args], {
+            cwd: ROOT_DIR,
+            stdio: ['ignore', 'pipe', 'pipe'],
+        });
+        let output = '';
+        child.stdout.on('data', chunk => { output += chunk; });
+        child.stderr.on('data', chunk => { output += chunk; });
+        child.on('close', code => resolve({ code, output }));
+    });
+}
+
+const inspected = {
+    firstPaint: 120,
+    firstContentfulPaint: 140,
+    renderBlocking: ['http://localhost:3000/style.css'],
+    images: [
+        {
+            url: 'http://localhost:3000/training-hero.jpg',
+            kind: 'background',
+            naturalWidth: 4000,
+            naturalHeight: 3000,
+            displayWidth: 1440,
+            displayHeight: 600,
+        },
+    ],
+};
+
+const resources = [
+    { url: 'http://localhost:3000/training', type: 'document', status: 200, transferBytes: 20000 },
+    { url: 'http://localhost:3000/style.css', type: 'stylesheet', status: 200, transferBytes: 8000 },
+    { url: 'http://localhost:3000/training-hero.jpg', type: 'image', status: 200, transferBytes: 583380 },
+];
+
+test.describe('Page weight crawler', () => {
+    test('totals transfer by resource type and sizes images', () => {
+        const page = summarizePage('/training', 200, resources, inspected);
+
+        expect(page.totalBytes).toBe(611380);
+        expect(page.byType).toEqual({ document: 20000, stylesheet: 8000, image: 583380 });
+        expect(page.images[0].transferBytes).toBe(583380);
+        expect(page.images[0].decodedBytes).toBe(4000 * 3000 * 4);
+        expect(page.images[0].oversizeRatio).toBeCloseTo(13.9, 1);
+    });
+
+    test('ranks shared assets once with every route that uses them', () => {
+        const pages = [
+            summarizePage('/training', 200, resources, inspected),
+            summarizePage('/', 200, resources.slice(1), { ...inspected, images: [] }),
+        ];
+
+        const [heaviest] = rankAssets(pages);
+        expect(heaviest.url).toBe('http://localhost:3000/training-hero.jpg');
+        expect(heaviest.routes).toEqual(['/training', '/']);
+    });
+
+    test('flags pages over their byte budget', () => {
+        const page = summarizePage('/training', 200, resources, inspected);
+
+        expect(checkBudgets([page], { default: 500 * 1024 })).toEqual([
+            { route: '/training', totalBytes: 611380, budget: 500 * 1024 },
+        ]);
+        expect(checkBudgets([page], { default: 1024 * 1024 })).toEqual([]);
+    });
+
+    test('rejects a concurrency or budget that is not a positive number', () => {
+        expect(parseArgs(['--concurrency', '2', '--budget-kb', '512'])).toMatchObject({ concurrency: 2, budget: 512 * 1024 });
+        for (const value of ['0', '-1', '1.5', 'four']) {
+            expect(() => parseArgs(['--concurrency', value])).toThrow('--concurrency must be a positive integer');
+        }
+        expect(() => parseArgs(['--budget-kb', 'lots'])).toThrow('--budget-kb must be a positive number');
+    });
+
+    test.describe('crawling a served page', () => {
+        let fixture;
+
+        test.beforeEach(async () => {
+            fixture = await startFixtureServer();
+        });
+
+        test.afterEach(async () => {
+            await fixture.close();
+        });
+
+        test('records transfer, render-blocking resources and oversized images', async () => {
+            const routes = ['/', '/training', '/diving'];
+            const pages = await crawl({ baseUrl: fixture.baseUrl, routes, concurrency: 2 });
+
+            expect(pages.map(page => page.route)).toEqual(routes);
+            // The pool never holds more pages open than its bound
+            expect(fixture.stats.maxInFlight).toBe(2);
+
+            const [home] = pages;
+            expect(home.status).toBe(200);
+            expect(home.byType.image).toBeGreaterThanOrEqual(PHOTO.length);
+            expect(home.byType.stylesheet).toBeGreaterThanOrEqual(STYLESHEET.length);
+            expect(home.byType.document).toBeGreaterThanOrEqual(FIXTURE_PAGE.length);
+            expect(home.totalBytes).toBe(Object.values(home.byType).reduce((sum, bytes) => sum + bytes, 0));
+            expect(home.renderBlocking).toContain(`${fixture.baseUrl}/blocking.css`);
+            expect(home.firstContentfulPaint).toBeGreaterThan(0);
+
+            const [photo] = home.images;
+            expect(photo.url).toBe(`${fixture.baseUrl}/photo.jpg`);
+            expect(photo.transferBytes).toBeGreaterThanOrEqual(PHOTO.length);
+            expect(photo.oversizeRatio).toBeGreaterThan(2);
+        });
+
+        test('exits non-zero only when a page is over budget', async () => {
+            const overBudget = await runCli(['--base-url', fixture.baseUrl, '--route', '/', '--budget-kb', '100']);
+            expect(overBudget.code).toBe(1);
+            expect(overBudget.output).toContain('Over budget');
+
+            const withinBudget = await runCli(['--base-url', fixture.baseUrl, '--route', '/', '--budget-kb', '10000']);
+            expect(withinBudget.code).toBe(0);
+        });
+    });
+});
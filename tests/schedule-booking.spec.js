@@ -3,7 +3,7 @@
  * Tests the complete booking system from service selection to confirmation
  */
 
-import { test, expect } from '@playwright/test';
+import { test, expect } from './support/coverage-fixture.js';
 
 const BASE_URL = process.env.VITE_APP_URL || 'http://localhost:3000';
 
@@ -0,0 +1,31 @@
+import { test as base, expect } from '@playwright/test';
+import { writeTestCoverage } from '../../scripts/test-impact/coverage-map.js';
+
+// Set TEST_IMPACT_COVERAGE=1 to record which estimator/checkout code each
+// test executes. Coverage is a Chromium-only API, other projects run as normal.
+const collectCoverage = !!process.env.TEST_IMPACT_COVERAGE;
+
+export const test = base.extend({
+    page: async ({ page, browserName }, use, testInfo) => {
+        const enabled = collectCoverage && browserName === 'chromium';
+        // Scripts get line-level coverage; everything else counts as a whole file
+        const resourceUrls = new Set();
+        if (enabled) {
+            page.on('response', response => {
+                if (response.request().resourceType() !== 'script') {
+                    resourceUrls.add(response.url());
+                }
+            });
+            await page.coverage.startJSCoverage({ resetOnNavigation: false });
+        }
+
+        await use(page);
+
+        if (enabled) {
+            const entries = await page.coverage.stopJSCoverage();
+            writeTestCoverage(testInfo, entries, [...resourceUrls]);
+        }
+    },
+});
+
+export { expect };
@@ -0,0 +1,140 @@
+import http from 'http';
+import { parseMultipart, buildMultipart, boundaryFrom } from '../../api/calendar-client.js';
+
+const STATUS_TEXT = { 200: 'OK', 204: 'No Content', 404: 'Not Found', 409: 'Conflict', 410: 'Gone', 412: 'Precondition Failed', 503: 'Service Unavailable' };
+
+/**
+ * In-process stand-in for the Google Calendar v3 API: events.list with sync
+ * tokens and the multipart batch endpoint. Every HTTP request is logged so
+ * tests can assert how many round trips a sync took.
+ */
+export async function startFakeCalendarServer({ pageSize = 250 } = {}) {
+    const events = new Map();
+    const changes = []; // event id per sequence number
+    const requests = [];
+    let tokenGeneration = 1;
+    let batchFailureStatus = null;
+
+    function touch(event) {
+        changes.push(event.id);
+        event.etag = `"${changes.length}"`;
+        // Keep `updated` strictly increasing even within one millisecond
+        event.updated = new Date(Date.now() + changes.length).toISOString();
+        events.set(event.id, event);
+        return event;
+    }
+
+    function handleEvent(method, eventId, headers, body) {
+        const existing = eventId ? events.get(eventId) : null;
+
+        if (method === 'POST') {
+            const id = body.id || `srv${changes.length + 1}`;
+            if (events.has(id)) return [409, { error: { message: 'The requested identifier already exists.' } }];
+            return [200, touch({ status: 'confirmed', ...body, id })];
+        }
+        if (!existing) return [404, { error: { message: 'Not Found' } }];
+        if (headers['if-match'] && headers['if-match'] !== existing.etag) {
+            return [412, { error: { message: 'Precondition Failed' } }];
+        }
+        if (method === 'DELETE') {
+            if (existing.status === 'cancelled') return [410, { error: { message: 'Resource has been deleted' } }];
+            touch({ ...existing, status: 'cancelled' });
+            return [204, null];
+        }
+        if (method === 'PATCH') return [200, touch({ ...existing, ...body, id: existing.id })];
+        if (method === 'PUT') return [200, touch({ ...body, id: existing.id })];
+        return [405, { error: { message: 'Method not allowed' } }];
+    }
+
+    function listEvents(params) {
+        const syncToken = params.get('syncToken');
+        let items;
+        if (syncToken) {
+            const [generation, seq] = syncToken.split(':').map(Number);
+            if (generation !== tokenGeneration) return [410, { error: { message: 'Sync token is no longer valid' } }];
+            items = [...new Set(changes.slice(seq))].map(id => events.get(id));
+        } else {
+            items = [...events.values()].filter(event => event.status !== 'cancelled');
+        }
+
+        const offset = Number(params.get('pageToken') || 0);
+        const page = { items: items.slice(offset, offset + pageSize) };
+        if (offset + pageSize < items.length) {
+            page.nextPageToken = String(offset + pageSize);
+        } else {
+            page.nextSyncToken = `${tokenGeneration}:${changes.length}`;
+        }
+        return [200, page];
+    }
+
+    const eventPath = /^\/calendar\/v3\/calendars\/[^/]+\/events(?:\/([^/?]+))?$/;
+
+    const server = http.createServer(async (req, res) => {
+        let raw = '';
+        for await (const chunk of req) raw += chunk;
+        const url = new URL(req.url, 'http://localhost');
+        requests.push({ method: req.method, path: url.pathname });
+
+        const send = (status, body, contentType = 'application/json') => {
+            res.writeHead(status, { 'Content-Type': contentType });
+            res.end(typeof body === 'string' ? body : JSON.stringify(body));
+        };
+
+        if (req.method === 'GET' && eventPath.test(url.pathname)) {
+            const [status, body] = listEvents(url.searchParams);
+            return send(status, body);
+        }
+
+        if (req.method === 'POST' && url.pathname === '/batch/calendar/v3') {
+            const parts = parseMultipart(raw, boundaryFrom(req.headers['content-type']));
+            const failureStatus = batchFailureStatus;
+            batchFailureStatus = null;
+            const responses = parts.map(part => {
+                const [method, target] = part.http.startLine.split(' ');
+                const match = eventPath.exec(target);
+                const [status, body] = failureStatus
+                    ? [failureStatus, { error: { message: STATUS_TEXT[failureStatus] || 'Batch failure' } }]
+                    : match
+                    ? handleEvent(method, match[1] && decodeURIComponent(match[1]), part.http.headers,
+                        part.http.body ? JSON.parse(part.http.body) : {})
+                    : [404, { error: { message: 'Unknown path' } }];
+                const contentId = part.headers['content-id'].replace(/[<>]/g, '');
+                const headers = body ? 'Content-Type: application/json; charset=UTF-8\r\n' : '';
+                return {
+                    contentId: `response-${contentId}`,
+                    http: `HTTP/1.1 ${status} ${STATUS_TEXT[status] || ''}\r\n${headers}\r\n${body ? JSON.stringify(body) : ''}`,
+                };
+            });
+            const boundary = 'batch_fake_response';
+            return send(200, buildMultipart(responses, boundary), `multipart/mixed; boundary=${boundary}`);
+        }
+
+        send(404, { error: { message: 'Not Found' } });
+    });
+
+    await new Promise(resolve => server.listen(0, '127.0.0.1', resolve));
+    const { port } = server.address();
+
+    return {
+        baseUrl: `http://127.0.0.1:${port}`,
+        events,
+        requests,
+        /** Simulate someone editing the event in Google Calendar */
+        editEvent(id, fields) {
+            return touch({ ...events.get(id), ...fields });
+        },
+        deleteEvent(id) {
+            return touch({ ...events.get(id), status: 'cancelled' });
+        },
+        /** Fail every request in the next batch with `status`, leaving events untouched */
+        failNextBatch(status = 503) {
+            batchFailureStatus = status;
+        },
+        expireSyncTokens() {
+            tokenGeneration++;
+        },
+        close() {
+            return new Promise(resolve => server.close(resolve));
+        },
+    };
+}
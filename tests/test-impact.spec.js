@@ -0,0 +1,181 @@
+import { test, expect } from '@playwright/test';
+import { coveredLineRanges, coveredFunctionNames, resolveSourcePath, addResourceDependencies } from '../scripts/test-impact/coverage-map.js';
+import { parseChangedLines, selectTests } from '../scripts/test-impact/select-tests.js';
+
+const source = [
+    'const rate = 4.50;',
+    'function calculateCost() {',
+    '    return rate * 40;',
+    '}',
+    'function showCheckout() {',
+    '    return true;',
+    '}',
+    'calculateCost();',
+].join('\n');
+
+const functions = [
+    { functionName: '', ranges: [{ startOffset: 0, endOffset: source.length, count: 1 }] },
+    {
+        functionName: 'calculateCost',
+        ranges: [{ startOffset: source.indexOf('function calculateCost'), endOffset: source.indexOf('}') + 1, count: 1 }],
+    },
+    {
+        functionName: 'showCheckout',
+        ranges: [{ startOffset: source.indexOf('function showCheckout'), endOffset: source.lastIndexOf('}') + 1, count: 0 }],
+    },
+];
+
+test.describe('Test impact analysis', () => {
+    test('maps V8 coverage to executed lines and functions', () => {
+        expect(coveredLineRanges(source, functions)).toEqual([[1, 4], [8, 8]]);
+        expect(coveredFunctionNames(functions)).toEqual(['calculateCost']);
+    });
+
+    test('resolves served scripts back to repo files', () => {
+        expect(resolveSourcePath('http://localhost:3000/script.js')).toBe('public/script.js');
+        expect(resolveSourcePath('https://js.stripe.com/v3/')).toBeNull();
+    });
+
+    test('resolves HTML routes from server.js to their pages', () => {
+        expect(resolveSourcePath('http://localhost:3000/')).toBe('index.html');
+        expect(resolveSourcePath('http://localhost:3000/diving')).toBe('diving/diving.html');
+        expect(resolveSourcePath('http://localhost:3000/admin')).toBe('admin/admin.html');
+        expect(resolveSourcePath('http://localhost:3000/admin/')).toBe('admin/admin.html');
+        expect(resolveSourcePath('http://localhost:5173/')).toBe('index.html');
+
+        const sources = addResourceDependencies({}, ['http://localhost:3000/diving', 'http://localhost:3000/style.css']);
+        expect(Object.keys(sources)).toEqual(['diving/diving.html', 'public/style.css']);
+    });
+
+    test('parses old-side line ranges from a zero-context diff', () => {
+        const diff = [
+            'diff --git a/public/script.js b/public/script.js',
+            '--- a/public/script.js',
+            '+++ b/public/script.js',
+            '@@ -3 +3 @@ function calculateCost() {',
+            '-    return rate * 40;',
+            '+    return rate * 42;',
+            '@@ -6,0 +7,1 @@',
+            '+    console.log("checkout");',
+        ].join('\n');
+
+        expect(parseChangedLines(diff)).toEqual({ 'public/script.js': [[3, 3], [6, 7]] });
+    });
+
+    test('treats removed comment lines as content and binary files as entirely changed', () => {
+        const diff = [
+            'diff --git a/supabase/migrations/015_calendar_sync.sql b/supabase/migrations/015_calendar_sync.sql',
+            'index 1111111..2222222 100644',
+            '--- a/supabase/migrations/015_calendar_sync.sql',
+            '+++ b/supabase/migrations/015_calendar_sync.sql',
+            '@@ -2,2 +1,0 @@',
+            '--- Migration 015: Incremental Google Calendar Sync',
+            '--- ============================================',
+            '@@ -20 +18 @@',
+            '-ADD COLUMN IF NOT EXISTS google_event_hash TEXT;',
+            '+ADD COLUMN IF NOT EXISTS google_event_hash VARCHAR(40);',
+            'diff --git a/public/hero-background.png b/public/hero-background.png',
+            'index 3333333..4444444 100644',
+            'Binary files a/public/hero-background.png and b/public/hero-background.png differ',
+        ].join('\n');
+
+        const changes = parseChangedLines(diff);
+        expect(changes).toEqual({
+            'supabase/migrations/015_calendar_sync.sql': [[2, 3], [20, 20]],
+            'public/hero-background.png': [],
+        });
+
+        const index = {
+            tests: {
+                'tests/e2e/home.spec.js:3': {
+                    file: 'tests/e2e/home.spec.js',
+                    sources: { 'public/hero-background.png': { functions: [], lines: [[1, Number.MAX_SAFE_INTEGER]] } },
+                },
+            },
+        };
+        const imageChange = { 'public/hero-background.png': changes['public/hero-background.png'] };
+        expect(selectTests(index, imageChange).selected).toEqual(['tests/e2e/home.spec.js:3']);
+        expect(selectTests(index, { 'public/sailing-photo.jpg': [] }).all).toBe(true);
+    });
+
+    test('selects only tests whose covered lines changed', () => {
+        const index = {
+            tests: {
+                'tests/e2e/pricing.spec.js:3': {
+                    file: 'tests/e2e/pricing.spec.js',
+                    sources: { 'public/script.js': { functions: ['calculateCost'], lines: [[1, 4], [8, 8]] } },
+                },
+                'tests/e2e/checkout.spec.js:3': {
+                    file: 'tests/e2e/checkout.spec.js',
+                    sources: { 'public/script.js': { functions: ['showCheckout'], lines: [[5, 7]] } },
+                },
+            },
+        };
+
+        const pricingChange = selectTests(index, { 'public/script.js': [[3, 3]] });
+        expect(pricingChange.selected).toEqual(['tests/e2e/pricing.spec.js:3']);
+
+        const configChange = selectTests(index, { 'playwright.config.js': [[10, 10]] });
+        expect(configChange.all).toBe(true);
+    });
+
+    test('runs the full suite for changed files no indexed test maps', () => {
+        const index = {
+            tests: {
+                'tests/e2e/diving.spec.js:3': {
+                    file: 'tests/e2e/diving.spec.js',
+                    sources: { 'diving/diving.html': { functions: [], lines: [[1, Number.MAX_SAFE_INTEGER]] } },
+                },
+            },
+        };
+
+        expect(selectTests(index, { 'diving/diving.html': [[40, 40]] }).selected).toEqual(['tests/e2e/diving.spec.js:3']);
+        for (const file of ['public/style.css', 'admin/admin.html', 'api/calendar-sync.js']) {
+            expect(selectTests(index, { [file]: [[1, 1]] }).all).toBe(true);
+        }
+        expect(selectTests(index, { 'DEPLOYMENT_CHECKLIST.md': [[1, 1]] }).all).toBe(false);
+    });
+
+    test('always includes specs that have no index entry', () => {
+        const index = {
+            tests: {
+                'tests/e2e/pricing.spec.js:3': {
+                    file: 'tests/e2e/pricing.spec.js',
+                    sources: { 'public/script.js': { functions: [], lines: [[1, 4]] } },
+                },
+            },
+        };
+        const specFiles = ['tests/cost-calculator.spec.js', 'tests/e2e/pricing.spec.js', 'tests/test-impact.spec.js'];
+
+        const result = selectTests(index, { 'public/script.js': [[40, 40]] }, specFiles);
+        expect(result.selected).toEqual(['tests/cost-calculator.spec.js', 'tests/test-impact.spec.js']);
+        expect(result.reasons['tests/cost-calculator.spec.js']).toEqual(['not in index']);
+    });
+
+    test('selects Python tests from their recorded coverage like specs', () => {
+        const index = {
+            tests: {
+                'tests/e2e/pricing.spec.js:3': {
+                    file: 'tests/e2e/pricing.spec.js',
+                    sources: { 'public/script.js': { functions: [], lines: [[1, 4]] } },
+                },
+                'tests/test_checkout_intervals.py:4': {
+                    file: 'tests/test_checkout_intervals.py',
+                    sources: { 'public/script.js': { functions: [], lines: [[30, 50]] } },
+                },
+            },
+        };
+        const specFiles = ['tests/e2e/pricing.spec.js', 'tests/test_checkout_intervals.py', 'tests/test_layout.py'];
+
+        const pricingChange = selectTests(index, { 'public/script.js': [[3, 3]] }, specFiles);
+        expect(pricingChange.selected).toEqual(['tests/test_layout.py', 'tests/e2e/pricing.spec.js:3']);
+        expect(pricingChange.reasons['tests/test_layout.py']).toEqual(['not in index']);
+
+        const checkoutChange = selectTests(index, { 'public/script.js': [[40, 40]] }, specFiles);
+        expect(checkoutChange.selected).toEqual(['tests/test_layout.py', 'tests/test_checkout_intervals.py:4']);
+
+        expect(selectTests(index, { 'tests/test_checkout_intervals.py': [[10, 10]] }).selected)
+            .toEqual(['tests/test_checkout_intervals.py']);
+        expect(selectTests(index, { 'tests/conftest.py': [[1, 1]] }).all).toBe(true);
+    });
+});
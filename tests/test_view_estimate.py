@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 from playwright.sync_api import sync_playwright
+import os
 import time
 
+# Set HEADED=1 to watch the run and keep the browser open afterwards
+HEADED = bool(os.environ.get("HEADED"))
+
 def test_view_estimate_button():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)  # Show browser for debugging
+        browser = p.chromium.launch(headless=not HEADED)
         page = browser.new_page()
         
         # Navigate to the local server
@@ -79,8 +83,9 @@ def test_view_estimate_button():
         print(f"After second click, current step: {visible_step}")
         
         # Keep browser open for manual inspection
-        print("\n⚠️  Browser will close in 5 seconds...")
-        time.sleep(5)
+        if HEADED:
+            print("\n⚠️  Browser will close in 5 seconds...")
+            time.sleep(5)
         
         browser.close()
 
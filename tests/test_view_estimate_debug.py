@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 from playwright.sync_api import sync_playwright
+import os
 import time
 
+# Set HEADED=1 to watch the run and keep the browser open afterwards
+HEADED = bool(os.environ.get("HEADED"))
+
 def test_view_estimate_debug():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)  # Show browser
+        browser = p.chromium.launch(headless=not HEADED)
         page = browser.new_page()
         
         # Enable console logging
@@ -51,8 +55,9 @@ def test_view_estimate_debug():
             cost_display = page.locator('#totalCostDisplay').text_content()
             print(f"Total cost displayed: {cost_display}")
         
-        print("\n⚠️  Browser will stay open for 10 seconds to check console...")
-        time.sleep(10)
+        if HEADED:
+            print("\n⚠️  Browser will stay open for 10 seconds to check console...")
+            time.sleep(10)
         
         browser.close()
 
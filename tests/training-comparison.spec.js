@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from './support/coverage-fixture.js';
 import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';